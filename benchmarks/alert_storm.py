@@ -0,0 +1,53 @@
+"""
+Error storm through AlertDispatcher against a local stub sink: how many
+alerts reach the sink, in how many batches, and what was folded or shed.
+
+    python benchmarks/alert_storm.py [errors]
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+
+# Ensure project root is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.alerts import AlertDispatcher
+
+class StubSink:
+    def __init__(self, latency: float = 0.02):
+        self.latency = latency
+        self.calls = 0
+        self.alerts = 0
+
+    async def __call__(self, batch):
+        # Stand-in for one outbound HTTP request per batch
+        self.calls += 1
+        self.alerts += len(batch)
+        await asyncio.sleep(self.latency)
+
+async def main(errors: int):
+    sink = StubSink()
+    dispatcher = AlertDispatcher(sink=sink, max_queue=500, batch_size=50, flush_interval=0.1, dedupe_window=60)
+    dispatcher.start()
+
+    rng = random.Random(7)
+    severities = ["low"] * 60 + ["medium"] * 30 + ["high"] * 9 + ["critical"]
+    start = time.perf_counter()
+    for i in range(errors):
+        # A storm is mostly the same few failures repeating
+        message = f"db timeout on worker {rng.randint(0, 20)}" if rng.random() < 0.9 else f"unique failure {i}"
+        dispatcher.submit(rng.choice(severities), message)
+        if i % 1000 == 0:
+            await asyncio.sleep(0)
+    submit_time = time.perf_counter() - start
+
+    await dispatcher.stop()
+    print(f"errors submitted:   {errors} in {submit_time * 1000:.1f} ms")
+    print(f"sink calls:         {sink.calls}")
+    print(f"alerts delivered:   {sink.alerts}")
+    print(f"dispatcher stats:   {dispatcher.stats()}")
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,76 @@
+"""
+Concurrent read/write throughput against a scratch SQLite file: the old
+default engine versus build_engine (WAL + pragmas, separate reader pool).
+
+    python benchmarks/db_throughput.py [workers] [seconds]
+"""
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Ensure project root is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from core.config import settings
+from core.database import build_engine, pool_stats
+
+WRITE_RATIO = 0.2
+
+async def setup(url: str):
+    eng = create_async_engine(url)
+    async with eng.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, payload TEXT)"))
+        await conn.execute(text("INSERT INTO items (payload) VALUES " + ",".join(["('x')"] * 1000)))
+    await eng.dispose()
+
+async def worker(writer, reader, deadline, results):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if random.random() < WRITE_RATIO:
+                async with writer.begin() as conn:
+                    await conn.execute(text("INSERT INTO items (payload) VALUES ('y')"))
+            else:
+                async with reader.connect() as conn:
+                    await conn.execute(text("SELECT payload FROM items WHERE id = :id"), {"id": random.randint(1, 1000)})
+            results["latencies"].append(time.perf_counter() - start)
+        except Exception:
+            results["errors"] += 1
+
+async def run(label, writer, reader, workers, seconds):
+    results = {"latencies": [], "errors": 0}
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(*(worker(writer, reader, deadline, results) for _ in range(workers)))
+    lat = sorted(results["latencies"])
+    p = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))] * 1000 if lat else 0.0
+    print(f"{label:8s} ops/s={len(lat) / seconds:8.0f} errors={results['errors']:4d} p50={p(0.5):6.2f}ms p99={p(0.99):7.2f}ms")
+    return writer
+
+async def main(workers: int, seconds: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'default.db')}"
+        await setup(url)
+        # What core/database.py used to build
+        default = create_async_engine(url, connect_args={"check_same_thread": False})
+        await run("default", default, default, workers, seconds)
+        await default.dispose()
+
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'tuned.db')}"
+        await setup(url)
+        writer = build_engine(url, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+        reader = build_engine(url, settings.DB_READ_POOL_SIZE, settings.DB_READ_MAX_OVERFLOW, read_only=True)
+        await run("tuned", writer, reader, workers, seconds)
+        print("writer pool:", pool_stats(writer))
+        print("reader pool:", pool_stats(reader))
+        await writer.dispose()
+        await reader.dispose()
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 5
+    asyncio.run(main(workers, seconds))
@@ -0,0 +1,86 @@
+"""
+EXPLAIN QUERY PLAN for the hot-path queries against a scratch database
+built from the models plus migrations. Exits non-zero if any of them
+falls back to a full table scan, so it can gate CI.
+
+    python benchmarks/explain_hot_queries.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+# Ensure project root is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import select, text, desc, String, type_coerce
+from sqlalchemy.ext.asyncio import create_async_engine
+import main  # registers every model
+from core.database import Base
+from core.migrations import run_migrations
+from modules.jobs.models import Job, JobOffer
+from modules.users.models import Technician
+from modules.reviews.models import Review
+from modules.notifications.models import Notification
+from modules.admin.models import AuditLog
+from shared.enums import JobStatus, JobOfferStatus
+
+def hot_queries():
+    now = datetime.utcnow()
+    return {
+        "matching: open jobs": select(Job.id).where(Job.status == JobStatus.MATCHING).order_by(Job.created_at),
+        "matching: busy technicians": select(Job.technician_id).where(Job.status.in_([JobStatus.ASSIGNED, JobStatus.IN_PROGRESS])),
+        "matching: offers per job": select(JobOffer.technician_id, JobOffer.status).where(JobOffer.job_id == "job"),
+        "matching: expire offers": select(JobOffer.id).where(
+            JobOffer.job_id == "job", JobOffer.status == JobOfferStatus.PENDING, JobOffer.expires_at <= now
+        ),
+        "offers: technician pending": select(JobOffer.id).where(
+            JobOffer.technician_id == "tech", JobOffer.status == JobOfferStatus.PENDING
+        ),
+        "index: verified technicians": select(Technician.id, Technician.average_rating)
+            .where(Technician.is_verified == True)
+            .order_by(desc(Technician.average_rating)),
+        "index: changed technicians": select(Technician.id)
+            .where(type_coerce(Technician.updated_at, String) >= "2026-01-01 00:00:00"),
+        "notifications: feed page": select(Notification.id).where(Notification.user_id == "user")
+            .order_by(desc(Notification.created_at), desc(Notification.id)).limit(20),
+        "reviews: by job": select(Review.id).where(Review.job_id == "job"),
+        "jobs: customer list": select(Job.id).where(Job.customer_id == "user")
+            .order_by(desc(Job.created_at), desc(Job.id)).limit(20),
+        "jobs: technician list": select(Job.id).where(Job.technician_id == "tech")
+            .order_by(desc(Job.created_at), desc(Job.id)).limit(20),
+        "jobs: admin list": select(Job.id).order_by(desc(Job.created_at), desc(Job.id)).limit(20),
+        "jobs: admin by status": select(Job.id).where(Job.status == JobStatus.ASSIGNED)
+            .order_by(desc(Job.created_at), desc(Job.id)).limit(20),
+        "audit logs: page": select(AuditLog.id).order_by(desc(AuditLog.created_at), desc(AuditLog.id)).limit(50),
+        "audit logs: by user": select(AuditLog.id).where(AuditLog.user_id == "user")
+            .order_by(desc(AuditLog.created_at), desc(AuditLog.id)).limit(50),
+        "audit logs: by action": select(AuditLog.id).where(AuditLog.action == "APPROVE_TECHNICIAN")
+            .order_by(desc(AuditLog.created_at), desc(AuditLog.id)).limit(50),
+    }
+
+def is_scan(detail: str) -> bool:
+    # "SCAN t USING [COVERING] INDEX" still walks an index in order; a bare
+    # "SCAN t" reads the whole table
+    return detail.startswith("SCAN") and "USING" not in detail
+
+async def main_check() -> int:
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'explain.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(run_migrations)
+            for name, stmt in hot_queries().items():
+                sql = str(stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+                rows = (await conn.execute(text("EXPLAIN QUERY PLAN " + sql))).all()
+                details = [row[-1] for row in rows]
+                bad = [d for d in details if is_scan(d)]
+                failures += bool(bad)
+                print(f"{'FAIL' if bad else 'ok  '} {name}: {' | '.join(details)}")
+        await engine.dispose()
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main_check()))
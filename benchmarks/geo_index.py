@@ -0,0 +1,64 @@
+"""
+k-nearest technician lookup through the in-memory GeoIndex against
+ranking every technician per query, with 100k synthetic technicians
+spread over a metro-sized area.
+
+    python benchmarks/geo_index.py [technicians] [queries]
+"""
+import os
+import random
+import sys
+import time
+
+# Ensure project root is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from workers.geo_index import haversine_km
+from workers.technician_index import TechnicianIndex
+
+CENTER = (11.5564, 104.9282)
+SPREAD_DEGREES = 0.5
+K = 10
+
+def main(technicians: int, queries: int):
+    rng = random.Random(42)
+    points = {
+        f"tech-{i}": (
+            CENTER[0] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES),
+            CENTER[1] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES),
+        )
+        for i in range(technicians)
+    }
+
+    index = TechnicianIndex()
+    start = time.perf_counter()
+    for tech_id, (lat, lng) in points.items():
+        index.upsert(tech_id, rng.uniform(0, 5), lat, lng)
+    build = time.perf_counter() - start
+
+    jobs = [
+        (CENTER[0] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES), CENTER[1] + rng.uniform(-SPREAD_DEGREES, SPREAD_DEGREES))
+        for _ in range(queries)
+    ]
+
+    start = time.perf_counter()
+    for lat, lng in jobs:
+        index.nearest(lat, lng, k=K)
+    indexed = (time.perf_counter() - start) / queries
+
+    brute_queries = max(1, queries // 20)
+    start = time.perf_counter()
+    for lat, lng in jobs[:brute_queries]:
+        sorted(points, key=lambda t: haversine_km(lat, lng, *points[t]))[:K]
+    brute = (time.perf_counter() - start) / brute_queries
+
+    print(f"technicians:          {technicians}")
+    print(f"index build:          {build * 1000:.1f} ms")
+    print(f"k={K} via GeoIndex:    {indexed * 1000:.3f} ms/query")
+    print(f"k={K} via full rank:   {brute * 1000:.3f} ms/query")
+    print(f"speed-up:             {brute / indexed:.0f}x")
+
+if __name__ == "__main__":
+    technicians = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    main(technicians, queries)
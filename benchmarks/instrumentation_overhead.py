@@ -0,0 +1,61 @@
+"""
+Cost of the request instrumentation: the cursor-execute hooks per SQL
+statement and MetricsMiddleware per request (against a bare ASGI app, so
+only the middleware's own work is measured).
+
+    python benchmarks/instrumentation_overhead.py
+"""
+import os
+import sys
+import time
+import asyncio
+
+# Ensure project root is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import instrumentation
+from core.instrumentation import MetricsMiddleware, Operation, _current
+
+STATEMENTS = 200_000
+REQUESTS = 50_000
+
+class FakeConnection:
+    def __init__(self):
+        self.info = {}
+
+def bench_hooks() -> float:
+    conn = FakeConnection()
+    token = _current.set(Operation("bench"))
+    start = time.perf_counter()
+    for _ in range(STATEMENTS):
+        instrumentation._before_cursor_execute(conn, None, "SELECT 1", (), None, False)
+        instrumentation._after_cursor_execute(conn, None, "SELECT 1", (), None, False)
+    elapsed = time.perf_counter() - start
+    _current.reset(token)
+    return elapsed / STATEMENTS * 1e9
+
+async def bare_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"text/plain")]})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+async def drive(app) -> float:
+    scope = {"type": "http", "method": "GET", "path": "/bench", "headers": []}
+    async def receive():
+        return {"type": "http.request", "body": b""}
+    async def send(message):
+        pass
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+def main():
+    per_statement_ns = bench_hooks()
+    bare_us = asyncio.run(drive(bare_app))
+    wrapped_us = asyncio.run(drive(MetricsMiddleware(bare_app)))
+    print(f"cursor hooks:      {per_statement_ns:8.0f} ns per statement")
+    print(f"bare ASGI app:     {bare_us:8.2f} us per request")
+    print(f"with middleware:   {wrapped_us:8.2f} us per request (+{wrapped_us - bare_us:.2f} us)")
+
+if __name__ == "__main__":
+    main()
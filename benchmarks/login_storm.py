@@ -0,0 +1,71 @@
+"""
+Event-loop latency seen by other requests while a burst of logins
+verifies passwords, with pbkdf2 run inline on the loop versus through the
+bounded process pool in core.security.
+
+    python benchmarks/login_storm.py [concurrent logins]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Ensure project root is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.exceptions import ServiceUnavailableException
+from core.security import get_password_hash, verify_password, verify_password_async, shutdown_hash_pool
+
+TICK = 0.005
+
+async def probe(stop: asyncio.Event, lags: list):
+    # Stand-in for any other endpoint: how late does a 5ms timer fire?
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(TICK)
+        lags.append((loop.time() - start - TICK) * 1000)
+
+async def inline_login(hashed: str):
+    return verify_password("secret", hashed)
+
+async def pooled_login(hashed: str):
+    try:
+        return await verify_password_async("secret", hashed)
+    except ServiceUnavailableException:
+        return None
+
+async def storm(login, hashed: str, logins: int):
+    stop = asyncio.Event()
+    lags = []
+    prober = asyncio.create_task(probe(stop, lags))
+    await asyncio.sleep(TICK * 2)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(login(hashed) for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await prober
+    lags.sort()
+    return {
+        "logins/s": logins / elapsed,
+        "shed": sum(1 for r in results if r is None),
+        "lag p50 ms": statistics.median(lags) if lags else 0.0,
+        "lag p99 ms": lags[int(len(lags) * 0.99) - 1] if lags else 0.0,
+        "lag max ms": lags[-1] if lags else 0.0,
+    }
+
+async def main(logins: int):
+    hashed = get_password_hash("secret")
+    # Warm the pool so process start-up is not measured
+    await verify_password_async("secret", hashed)
+
+    for name, login in (("inline", inline_login), ("process pool", pooled_login)):
+        result = await storm(login, hashed, logins)
+        print(f"{name:>12}: " + ", ".join(f"{k} {v:.1f}" if isinstance(v, float) else f"{k} {v}" for k, v in result.items()))
+    shutdown_hash_pool()
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
@@ -0,0 +1,79 @@
+"""
+Sweep time of workers.matching.process_matching against the number of
+open jobs. Uses a throwaway SQLite file so it never touches fixmate.db.
+
+    python benchmarks/matching_sweep.py [job counts...]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+# Ensure project root is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from core.database import Base
+import main  # noqa: F401  (registers every model on Base.metadata)
+from modules.auth.models import User, generate_uuid
+from modules.users.models import Technician
+from modules.services.models import Service
+from modules.jobs.models import Job
+from shared.enums import UserRole, JobStatus
+from workers.matching import process_matching
+from workers.technician_index import technician_index
+
+TECHNICIANS = 200
+
+async def run(job_count: int):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    sessions = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+
+    statements = 0
+    def count(*args):
+        nonlocal statements
+        statements += 1
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with sessions() as db:
+        customer_id = generate_uuid()
+        service_id = generate_uuid()
+        await db.execute(insert(User), [{"id": customer_id, "email": "bench@fixmate.com", "hashed_password": "x", "role": UserRole.CUSTOMER}])
+        await db.execute(insert(Service), [{"id": service_id, "name": "Bench", "base_price": 10.0}])
+        techs = [{"id": generate_uuid(), "email": f"tech{i}@fixmate.com", "hashed_password": "x", "role": UserRole.TECHNICIAN} for i in range(TECHNICIANS)]
+        await db.execute(insert(User), techs)
+        await db.execute(insert(Technician), [
+            {"user_id": t["id"], "is_verified": True, "average_rating": (i % 50) / 10} for i, t in enumerate(techs)
+        ])
+        await db.execute(insert(Job), [
+            {"customer_id": customer_id, "service_id": service_id, "location": "bench", "status": JobStatus.MATCHING}
+            for _ in range(job_count)
+        ])
+        await db.commit()
+
+    # The resident index is process-wide; drop the previous run's technicians
+    technician_index.invalidate()
+    statements = 0
+    async with sessions() as db:
+        start = time.perf_counter()
+        await process_matching(db)
+        elapsed = time.perf_counter() - start
+
+    await engine.dispose()
+    return elapsed, statements
+
+async def main_bench(counts):
+    print(f"{'jobs':>8} {'sweep ms':>10} {'statements':>11}")
+    for count in counts:
+        elapsed, statements = await run(count)
+        print(f"{count:>8} {elapsed * 1000:>10.1f} {statements:>11}")
+
+if __name__ == "__main__":
+    counts = [int(a) for a in sys.argv[1:]] or [100, 1000, 5000]
+    asyncio.run(main_bench(counts))
@@ -0,0 +1,93 @@
+"""
+SQL statements issued per write endpoint, counted with a cursor-execute
+hook on a scratch database. The app's lifespan (and so the background
+workers) is not started, so every statement counted belongs to the
+request. Auth is warmed up first so the principal cache doesn't skew
+the numbers.
+
+    python benchmarks/queries_per_endpoint.py
+    SHOW_SQL=1 python benchmarks/queries_per_endpoint.py  # print each statement
+"""
+import os
+import sys
+import tempfile
+
+# Ensure project root is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_tmp.name, 'bench.db')}"
+
+import asyncio
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+import main
+from core.config import settings
+from core.database import engine, Base
+from core.migrations import run_migrations
+
+P = settings.API_PREFIX
+statements = []
+
+def _count(conn, cursor, statement, parameters, context, executemany):
+    statements.append(statement.split(None, 1)[0].upper())
+    if os.environ.get("SHOW_SQL"):
+        print(statement)
+
+async def setup():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
+
+def main_bench():
+    asyncio.run(setup())
+    client = TestClient(main.app, raise_server_exceptions=False)  # no lifespan: workers stay off
+    event.listen(engine.sync_engine, "before_cursor_execute", _count)
+    results = []
+
+    def call(label, method, path, headers=None, **kwargs):
+        statements.clear()
+        response = client.request(method, P + path, headers=headers, **kwargs)
+        kinds = ",".join(statements)
+        results.append((label, response.status_code, len(statements), kinds))
+        return response
+
+    def user(email, role):
+        client.post(P + "/auth/register", json={"email": email, "password": "pw", "role": role})
+        token = client.post(P + "/auth/login", data={"username": email, "password": "pw"}).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        client.get(P + "/auth/me", headers=headers)
+        return headers
+
+    admin, customer, tech = user("admin@x.com", "ADMIN"), user("cust@x.com", "CUSTOMER"), user("tech@x.com", "TECHNICIAN")
+
+    call("POST /auth/register", "POST", "/auth/register", json={"email": "new@x.com", "password": "pw", "role": "CUSTOMER"})
+    technician = call("POST /technicians/apply", "POST", "/technicians/apply", headers=tech, json={"bio": "b"})
+    if technician.status_code == 200:
+        call("PUT /technicians/{id}/approve", "PUT", f"/technicians/{technician.json()['id']}/approve", headers=admin)
+    service_id = call("POST /services/", "POST", "/services/", headers=admin, json={"name": "Plumbing", "base_price": 10}).json()["id"]
+    call("PUT /services/{id}", "PUT", f"/services/{service_id}", headers=admin, json={"base_price": 12})
+    job_id = call("POST /jobs/", "POST", "/jobs/", headers=customer, json={"service_id": service_id, "location": "x"}).json()["id"]
+
+    if technician.status_code == 200:
+        # Stand in for the matching worker
+        from workers.matching import process_matching
+        from core.database import SessionLocal
+        async def match():
+            async with SessionLocal() as db:
+                await process_matching(db)
+        asyncio.run(match())
+        call("POST /jobs/{id}/accept", "POST", f"/jobs/{job_id}/accept", headers=tech)
+        call("POST /jobs/{id}/start", "POST", f"/jobs/{job_id}/start", headers=tech)
+        call("POST /jobs/{id}/complete", "POST", f"/jobs/{job_id}/complete", headers=tech)
+        call("POST /reviews/", "POST", "/reviews/", headers=customer, json={"job_id": job_id, "rating": 5})
+    dispute = call("POST /disputes/", "POST", "/disputes/", headers=customer, json={"job_id": job_id, "reason": "late"})
+    if dispute.status_code == 200:
+        call("PUT /disputes/{id}/resolve", "PUT", f"/disputes/{dispute.json()['id']}/resolve", headers=admin, json={"outcome": "RESOLVED", "notes": "ok"})
+    call("DELETE /services/{id}", "DELETE", f"/services/{service_id}", headers=admin)
+
+    for label, status, count, kinds in results:
+        print(f"{label:32s} {status:3d} {count:2d}  {kinds}")
+
+if __name__ == "__main__":
+    main_bench()
@@ -0,0 +1,73 @@
+"""
+Realtime hub under 10k idle connections: memory per connection, publish
+cost for a single user's topic and for a hot topic with many followers,
+and publish-to-consumer latency. Each connection is modelled by a task
+blocked on its inbox, which is what an idle WebSocket costs the hub.
+
+    python benchmarks/realtime_fanout.py [connections]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Ensure project root is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.realtime import RealtimeHub, user_topic, technician_topic
+
+HOT_TOPIC_FOLLOWERS = 1000
+
+async def main(connections: int):
+    hub = RealtimeHub(max_queue=100)
+    latencies = []
+
+    async def connection(subscription):
+        while True:
+            message = await subscription.get()
+            latencies.append((time.perf_counter() - message["_published_at"]) * 1000)
+            hub.delivered(message)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = []
+    for i in range(connections):
+        topics = [user_topic(f"user-{i}")]
+        if i < HOT_TOPIC_FOLLOWERS:
+            topics.append(technician_topic("hot"))
+        tasks.append(asyncio.create_task(connection(hub.subscribe(topics))))
+    await asyncio.sleep(0)
+    per_connection = (tracemalloc.get_traced_memory()[0] - before) / connections
+    tracemalloc.stop()
+
+    # Targeted events: one user each
+    start = time.perf_counter()
+    for i in range(10_000):
+        hub.publish(user_topic(f"user-{i % connections}"), {"type": "job.status_changed"})
+    targeted_us = (time.perf_counter() - start) / 10_000 * 1e6
+    await asyncio.sleep(0.1)
+
+    # Hot topic: every follower gets the event
+    start = time.perf_counter()
+    for _ in range(100):
+        hub.publish(technician_topic("hot"), {"type": "offer.created"})
+    hot_ms = (time.perf_counter() - start) / 100 * 1000
+    await asyncio.sleep(0.5)
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    latencies.sort()
+    print(f"idle connections:        {connections}")
+    print(f"memory per connection:   {per_connection / 1024:.1f} KiB (hub + task)")
+    print(f"publish to one user:     {targeted_us:.1f} us")
+    print(f"publish to {HOT_TOPIC_FOLLOWERS} followers: {hot_ms:.2f} ms")
+    print(f"delivery latency p50:    {statistics.median(latencies):.2f} ms")
+    print(f"delivery latency p99:    {latencies[int(len(latencies) * 0.99) - 1]:.2f} ms")
+    print(f"hub stats:               {hub.stats()}")
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000))
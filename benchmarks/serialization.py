@@ -0,0 +1,81 @@
+"""
+Serialization cost of a 1k-item notifications page and audit log list,
+built from ORM objects without a database:
+
+  encoder   validate -> jsonable_encoder -> json.dumps (FastAPI's classic path)
+  orjson    validate -> model_dump -> orjson.dumps (if orjson is installed)
+  direct    core.serialization.Serializer (validate -> pydantic dump_json)
+
+    python benchmarks/serialization.py [items] [rounds]
+"""
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# Ensure project root is in python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+import main  # registers every model
+from core.serialization import Serializer
+from modules.admin.models import AuditLog
+from modules.admin.schemas import AuditLogResponse
+from modules.notifications.models import Notification
+from modules.notifications.schemas import NotificationResponse
+from shared.schemas import CursorPage
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def percentile(samples, q):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(q * len(samples)))] * 1000
+
+def measure(fn, rounds):
+    fn()
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return percentile(samples, 0.5), percentile(samples, 0.99)
+
+def run(label, schema, data, rounds):
+    serializer = Serializer(schema)
+    adapter = serializer.adapter
+    paths = {
+        "encoder": lambda: json.dumps(jsonable_encoder(adapter.validate_python(data, from_attributes=True))).encode(),
+        "direct": lambda: serializer.dumps(data),
+    }
+    if orjson is not None:
+        paths["orjson"] = lambda: orjson.dumps(adapter.dump_python(adapter.validate_python(data, from_attributes=True)))
+    for name, fn in paths.items():
+        p50, p99 = measure(fn, rounds)
+        print(f"{label:14s} {name:8s} p50={p50:7.2f}ms p99={p99:7.2f}ms")
+
+def main_bench(items: int, rounds: int):
+    now = datetime.utcnow()
+    notifications = [
+        Notification(
+            id=str(uuid.uuid4()), user_id="user", message=f"Job update {i}",
+            payload={"job_id": str(uuid.uuid4()), "status": "ASSIGNED"}, is_read=bool(i % 3),
+            created_at=now - timedelta(seconds=i),
+        )
+        for i in range(items)
+    ]
+    logs = [
+        AuditLog(id=str(uuid.uuid4()), user_id="admin", action="APPROVE_TECHNICIAN", details=f"tech {i}", created_at=now - timedelta(seconds=i))
+        for i in range(items)
+    ]
+    run("notifications", CursorPage[NotificationResponse], {"items": notifications, "next_cursor": "abc"}, rounds)
+    run("audit logs", list[AuditLogResponse], logs, rounds)
+
+if __name__ == "__main__":
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    main_bench(items, rounds)
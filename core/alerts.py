@@ -0,0 +1,113 @@
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from core.config import settings
+from core.metrics import register_stats
+from core.batching import BatchFlusher
+
+_file_logger = logging.getLogger("FixMate")
+
+SEVERITY_RANK = {"low": 0, "medium": 1, "high": 2, "critical": 3}
+
+AlertSink = Callable[[List[dict]], Awaitable[None]]
+
+async def sendErrors(alerts: List[dict]):
+    """
+    Placeholder for external notification logic. Receives one batch per
+    flush, so real delivery costs one outbound call per batch.
+    """
+    try:
+        # In a real application, you would make an HTTP request here
+        # print(f"[{len(alerts)} NOTIFICATIONS SENT]")
+        pass
+    except Exception as e:
+        _file_logger.error(f"Failed to send notification: {e}")
+
+class AlertDispatcher(BatchFlusher):
+    """
+    Bounded, deduplicating alert queue between `logger.error.<severity>()`
+    and the sink. High/critical alerts flush at once; a full queue sheds
+    the lowest severity first.
+    """
+    def __init__(
+        self,
+        sink: Optional[AlertSink] = None,
+        max_queue: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 5.0,
+        dedupe_window: float = 60.0,
+    ):
+        super().__init__(flush_interval)
+        self.sink = sink or sendErrors
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.dedupe_window = dedupe_window
+
+        self._queue: Deque[dict] = deque()
+        # (severity, message) -> (first seen, pending alert); removed once sent
+        self._recent: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+        self.counters = {"submitted": 0, "deduplicated": 0, "dropped": 0, "delivered": 0, "batches": 0, "failures": 0}
+
+    def submit(self, severity: str, msg: str):
+        """Queue an alert. Never blocks and never raises."""
+        self.counters["submitted"] += 1
+        now = time.monotonic()
+        key = (severity, msg)
+
+        seen = self._recent.get(key)
+        if seen is not None and now - seen[0] < self.dedupe_window:
+            # The window is measured from the first occurrence, so a steady
+            # stream of repeats can't hold it open forever
+            self.counters["deduplicated"] += 1
+            seen[1]["count"] += 1
+            return
+
+        alert = {"severity": severity, "message": msg, "count": 1, "first_seen": time.time()}
+        if len(self._queue) >= self.max_queue and not self._shed(severity):
+            self.counters["dropped"] += 1
+            return
+
+        self._queue.append(alert)
+        self._recent[key] = (now, alert)
+        if SEVERITY_RANK.get(severity, 0) >= SEVERITY_RANK["high"] or len(self._queue) >= self.batch_size:
+            self._signal()
+
+    def _shed(self, severity: str) -> bool:
+        rank = SEVERITY_RANK.get(severity, 0)
+        victim = min(self._queue, key=lambda a: SEVERITY_RANK.get(a["severity"], 0))
+        if SEVERITY_RANK.get(victim["severity"], 0) >= rank:
+            return False
+        self._queue.remove(victim)
+        self._recent.pop((victim["severity"], victim["message"]), None)
+        self.counters["dropped"] += 1
+        return True
+
+    async def flush(self):
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            for alert in batch:
+                # Later repeats start a new alert rather than bumping a sent one
+                key = (alert["severity"], alert["message"])
+                seen = self._recent.get(key)
+                if seen is not None and seen[1] is alert:
+                    del self._recent[key]
+            try:
+                await self.sink(batch)
+                self.counters["delivered"] += len(batch)
+            except Exception as e:
+                self.counters["failures"] += 1
+                _file_logger.error(f"Failed to send notification batch: {e}")
+            self.counters["batches"] += 1
+
+    def stats(self) -> dict:
+        return {**self.counters, "queued": len(self._queue), "capacity": self.max_queue}
+
+alert_dispatcher = AlertDispatcher(
+    max_queue=settings.ALERT_QUEUE_SIZE,
+    batch_size=settings.ALERT_BATCH_SIZE,
+    flush_interval=settings.ALERT_FLUSH_INTERVAL_SECONDS,
+    dedupe_window=settings.ALERT_DEDUPE_WINDOW_SECONDS,
+)
+
+register_stats("alerts", alert_dispatcher.stats)
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Optional
+
+class BatchFlusher:
+    """
+    Background task that calls `flush()` every `flush_interval` seconds,
+    or sooner when `_signal()` wakes it. `stop()` drains what is left.
+    """
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def _signal(self):
+        if self._wake is not None:
+            self._wake.set()
+
+    def start(self):
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # Let an in-flight batch finish rather than cancelling mid-write
+        if self._task is not None:
+            self._stopping = True
+            self._wake.set()
+            await self._task
+            self._task = None
+            self._stopping = False
+        await self.flush()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self):
+        raise NotImplementedError
@@ -1,20 +1,84 @@
 from pydantic_settings import BaseSettings
 from pydantic import ConfigDict
 from functools import lru_cache
+from typing import Optional
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "FixMate API"
     VERSION: str = "0.1.0"
     API_PREFIX: str = "/api/v1"
+    ENVIRONMENT: str = "development" # "production" disables console colours
     
     # Database
     DATABASE_URL: str = "sqlite+aiosqlite:///fixmate.db"
+    DATABASE_READ_URL: Optional[str] = None # Read replica; unset means reads share the writer engine
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_READ_POOL_SIZE: int = 10
+    DB_READ_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30 # Seconds to wait for a connection before erroring
+    DB_POOL_RECYCLE: int = 3600
+    DB_POOL_PRE_PING: bool = True
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0 # Reads stay on the primary this long after a caller commits
+    SQLITE_JOURNAL_MODE: str = "WAL" # Readers don't block the writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL" # Safe with WAL, fsync only on checkpoint
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000 # Wait on the write lock instead of "database is locked"
     
     # Security
     SECRET_KEY: str = "CHANGE_THIS_TO_A_SECURE_SECRET_KEY"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    AUTH_STATELESS: bool = False # Trust uid/role token claims, skip the user lookup
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_DEPTH: int = 64 # Waiting hash jobs before login/register return 503
+
+    # Matching
+    MATCHING_OFFER_TIMEOUT_SECONDS: int = 300
+    MATCHING_RECONCILE_INTERVAL_SECONDS: int = 60
+    MATCHING_TECHNICIAN_CAPACITY: int = 1 # Outstanding offers + active jobs per technician
+    MATCHING_MAX_DISTANCE_KM: float = 25.0
+
+    # Service catalogue
+    SERVICE_CATALOGUE_TTL_SECONDS: int = 300 # In-process copy; edits invalidate immediately
+    SERVICE_CATALOGUE_MAX_AGE: int = 60 # Cache-Control max-age sent to clients
+
+    # Notifications
+    NOTIFICATION_OUTBOX_BATCH_SIZE: int = 500
+    NOTIFICATION_OUTBOX_POLL_SECONDS: float = 30.0 # Safety net; commits wake the worker directly
+    REALTIME_CLIENT_QUEUE_SIZE: int = 100 # Undelivered push events kept per connection
     
+    # Logging
+    LOG_QUEUE_SIZE: int = 10000 # Records beyond this are dropped, never block
+    LOG_BATCH_SIZE: int = 256
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_BACKUP_COUNT: int = 5
+    LOG_CONSOLE: bool = True
+    LOG_CONSOLE_COLOR: Optional[bool] = None # Defaults to on outside production
+
+    # Error alerts (logger.error.<severity>)
+    ALERT_QUEUE_SIZE: int = 1000
+    ALERT_BATCH_SIZE: int = 50
+    ALERT_FLUSH_INTERVAL_SECONDS: float = 5.0
+    ALERT_DEDUPE_WINDOW_SECONDS: float = 60.0
+
+    # Request metrics (/metrics, X-DB-Queries and Server-Timing headers)
+    METRICS_ENABLED: bool = True
+    METRICS_TIMING_HEADERS: bool = True
+    METRICS_TOKEN: Optional[str] = None # Scrapers send "Authorization: Bearer <token>"; admin logins work too
+    METRICS_PUBLIC: bool = False # Serve /metrics without auth; only behind a private network
+    METRICS_SLOW_QUERY_MS: float = 100.0 # Statements slower than this are logged and sampled
+    METRICS_SLOW_QUERY_SAMPLES: int = 50 # Most recent slow statements kept for /admin/stats
+
+    # Audit log (buffered, written in bulk)
+    AUDIT_BUFFER_SIZE: int = 5000
+    AUDIT_BATCH_SIZE: int = 200
+    AUDIT_FLUSH_INTERVAL_SECONDS: float = 2.0
+    AUDIT_MAX_RETRIES: int = 3 # Failed flushes before a batch is written row by row
+
     model_config = ConfigDict(case_sensitive=True)
 
 @lru_cache()
@@ -1,12 +1,123 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+import time
+import hashlib
+from typing import Optional
+from fastapi.requests import HTTPConnection
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from core.config import settings
+from core.metrics import register_stats
+from core.cache import TTLCache
+from core.instrumentation import instrument_engine
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}, # Needed for SQLite
-    echo=False, # Disable SQL logging for development
-)
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = {"checkouts": 0, "checkins": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0, "timeouts": 0}
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.metrics["timeouts"] += 1
+            raise
+        finally:
+            waited = (time.perf_counter() - start) * 1000
+            self.metrics["wait_ms_total"] += waited
+            self.metrics["wait_ms_max"] = max(self.metrics["wait_ms_max"], waited)
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def _is_memory(url: str) -> bool:
+    return ":memory:" in url or url.rstrip("/").endswith("sqlite+aiosqlite:")
+
+def _sqlite_pragmas(read_only: bool):
+    pragmas = [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        # Negative cache_size is in KiB
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+    return on_connect
+
+def build_engine(url: str, pool_size: int, max_overflow: int, read_only: bool = False) -> AsyncEngine:
+    """
+    Engine factory driven by Settings. SQLite connections get WAL and the
+    other pragmas on connect; file databases use an instrumented queue pool
+    so checkout waits show up in stats.
+    """
+    kwargs = {
+        "echo": False, # Disable SQL logging for development
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if _is_sqlite(url):
+        kwargs["connect_args"] = {"check_same_thread": False} # Needed for SQLite
+    if not _is_memory(url):
+        kwargs.update(
+            poolclass=InstrumentedPool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+
+    new_engine = create_async_engine(url, **kwargs)
+    if _is_sqlite(url):
+        event.listen(new_engine.sync_engine, "connect", _sqlite_pragmas(read_only))
+    if settings.METRICS_ENABLED:
+        # Per-request query counts and DB time
+        instrument_engine(new_engine)
+
+    pool = new_engine.sync_engine.pool
+    if isinstance(pool, InstrumentedPool):
+        @event.listens_for(new_engine.sync_engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            pool.metrics["checkouts"] += 1
+
+        @event.listens_for(new_engine.sync_engine, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            pool.metrics["checkins"] += 1
+    return new_engine
+
+def pool_stats(target: AsyncEngine) -> dict:
+    pool = target.sync_engine.pool
+    stats = {"status": pool.status()}
+    if isinstance(pool, InstrumentedPool):
+        stats.update(pool.metrics)
+        stats["checked_out"] = pool.checkedout()
+        stats["size"] = pool.size()
+        stats["overflow"] = pool.overflow()
+    return stats
+
+# Writer: every mutation and the workers
+engine = build_engine(settings.DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW)
+
+# Reader: its own pool (read-only on SQLite) when DATABASE_READ_URL points
+# at a replica. Otherwise reads share the writer; an in-memory URL would
+# open a second, empty database.
+if settings.DATABASE_READ_URL and not _is_memory(settings.DATABASE_READ_URL):
+    read_engine = build_engine(
+        settings.DATABASE_READ_URL,
+        settings.DB_READ_POOL_SIZE,
+        settings.DB_READ_MAX_OVERFLOW,
+        read_only=True,
+    )
+else:
+    read_engine = engine
 
 SessionLocal = async_sessionmaker(
     bind=engine,
@@ -15,11 +126,73 @@ SessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+ReadSessionLocal = async_sessionmaker(
+    bind=read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Clients that committed through the primary recently. Their reads go to
+# the primary too until the window passes, so a replica that lags behind
+# never hides a write they just made.
+_recent_writers = TTLCache(maxsize=10000, ttl=settings.DB_READ_YOUR_WRITES_SECONDS)
+_read_routing = {"replica": 0, "primary_fallback": 0}
+
+def _client_key(connection: HTTPConnection) -> Optional[str]:
+    auth = connection.headers.get("authorization")
+    if not auth:
+        return None
+    return hashlib.sha256(auth.encode()).hexdigest()
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session):
+    key = session.info.get("client_key")
+    if key and settings.DB_READ_YOUR_WRITES_SECONDS > 0:
+        _recent_writers.set(key, True)
+
+def _db_pool_stats() -> dict:
+    stats = {"writer": pool_stats(engine), "read_routing": dict(_read_routing)}
+    if read_engine is not engine:
+        stats["reader"] = pool_stats(read_engine)
+    return stats
+
+register_stats("db_pool", _db_pool_stats)
+
 class Base(DeclarativeBase):
     pass
 
-async def get_db():
+async def save(db: AsyncSession, *instances):
+    """
+    Add `instances` and commit as one unit of work, returning the first.
+    Server defaults (created_at) come back through INSERT ... RETURNING and
+    expire_on_commit is off, so callers don't need a refresh SELECT afterwards.
+    """
+    db.add_all(instances)
+    await db.commit()
+    return instances[0] if instances else None
+
+async def get_db(connection: HTTPConnection):
     async with SessionLocal() as session:
+        session.info["client_key"] = _client_key(connection)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def get_read_db(connection: HTTPConnection):
+    """
+    Session on the read pool for GET endpoints that opt in. Falls back to
+    the primary for a caller that committed a write in the last few seconds.
+    """
+    key = _client_key(connection)
+    if key and _recent_writers.get(key):
+        _read_routing["primary_fallback"] += 1
+        factory = SessionLocal
+    else:
+        _read_routing["replica"] += 1
+        factory = ReadSessionLocal
+    async with factory() as session:
         try:
             yield session
         finally:
@@ -0,0 +1,214 @@
+import re
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, List, Optional, Tuple
+from sqlalchemy import event
+from core.config import settings
+from core.metrics import collect_stats, register_stats
+from core.log import logger
+
+# Request duration histogram bounds, seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Operation:
+    """SQL statements and DB time for one request or background run."""
+    __slots__ = ("name", "queries", "db_seconds")
+
+    def __init__(self, name: str = ""):
+        self.name = name
+        self.queries = 0
+        self.db_seconds = 0.0
+
+class OperationStats:
+    """Running totals for one route or background job."""
+    __slots__ = ("count", "errors", "seconds", "queries", "queries_max", "db_seconds", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.queries_max = 0
+        self.db_seconds = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1) # Last one is +Inf
+
+    def observe(self, op: Operation, seconds: float, failed: bool = False):
+        self.count += 1
+        self.errors += failed
+        self.seconds += seconds
+        self.queries += op.queries
+        self.queries_max = max(self.queries_max, op.queries)
+        self.db_seconds += op.db_seconds
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+
+_current: ContextVar[Optional[Operation]] = ContextVar("current_operation", default=None)
+
+# (method, route template) -> totals; route templates keep label cardinality bounded
+_routes: Dict[Tuple[str, str], OperationStats] = {}
+_background: Dict[str, OperationStats] = {}
+_unattributed = Operation() # Startup, audit flushes, anything outside a request or measure()
+_slow_queries: Deque[dict] = deque(maxlen=settings.METRICS_SLOW_QUERY_SAMPLES)
+_slow_total = 0
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    global _slow_total
+    started = conn.info.pop("query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    op = _current.get() or _unattributed
+    op.queries += 1
+    op.db_seconds += elapsed
+    if elapsed * 1000 >= settings.METRICS_SLOW_QUERY_MS:
+        _slow_total += 1
+        _slow_queries.append({
+            "operation": op.name or "unattributed",
+            "ms": round(elapsed * 1000, 3),
+            "statement": statement[:1000],
+            "at": time.time(),
+        })
+        logger.warn(f"Slow query ({elapsed * 1000:.1f} ms) in {op.name or 'unattributed'}: {statement[:200]}")
+
+def instrument_engine(target):
+    """Count and time every statement `target` (an AsyncEngine) executes."""
+    event.listen(target.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+@contextmanager
+def measure(name: str):
+    """
+    Attribute statements to a background job, e.g. one matching sweep.
+    Shows up in /metrics as fixmate_background_* with job="<name>".
+    """
+    op = Operation(name)
+    token = _current.set(op)
+    start = time.perf_counter()
+    failed = True
+    try:
+        yield op
+        failed = False
+    finally:
+        _current.reset(token)
+        _background.setdefault(name, OperationStats()).observe(op, time.perf_counter() - start, failed)
+
+def _route_template(scope) -> str:
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if not template:
+        return "unmatched"
+    # Routes on an included router carry only their own path; take the
+    # router prefix from the matching leading segments of the request path
+    segments = scope["path"].split("/")
+    return "/".join(segments[:-template.count("/")]) + template
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware task hop) that opens an
+    Operation per HTTP request, adds X-DB-Queries and Server-Timing headers
+    to the response and folds the totals into the matched route's stats.
+    Headers reflect the work done before the response started; anything a
+    streaming body does afterwards still counts towards the route.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        op = Operation(f"{scope['method']} {scope['path']}") # Slow-query samples show the concrete path
+        token = _current.set(op)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if settings.METRICS_TIMING_HEADERS:
+                    app_ms = (time.perf_counter() - start) * 1000
+                    headers = list(message.get("headers", []))
+                    headers.append((b"x-db-queries", str(op.queries).encode()))
+                    headers.append((b"server-timing", (
+                        f'db;dur={op.db_seconds * 1000:.1f};desc="{op.queries} queries", app;dur={app_ms:.1f}'
+                    ).encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            key = (scope["method"], _route_template(scope))
+            _routes.setdefault(key, OperationStats()).observe(op, time.perf_counter() - start, status >= 500)
+
+def _sql_stats() -> dict:
+    return {
+        "unattributed_queries": _unattributed.queries,
+        "unattributed_db_seconds": round(_unattributed.db_seconds, 6),
+        "slow_total": _slow_total,
+        "slow_samples": list(_slow_queries),
+    }
+
+register_stats("sql", _sql_stats)
+
+# Prometheus text exposition
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+def _metric_name(*parts: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", "_".join(parts))
+
+def _render_operations(lines: List[str], prefix: str, stats: Dict[tuple, OperationStats], label_names: Tuple[str, ...]):
+    items = [(_labels(**dict(zip(label_names, key if isinstance(key, tuple) else (key,)))), s) for key, s in list(stats.items())]
+    families = (
+        ("total", "counter", "Completed operations", lambda s: s.count),
+        ("errors_total", "counter", "Operations that failed (HTTP 5xx or an exception)", lambda s: s.errors),
+        ("db_queries_total", "counter", "SQL statements executed", lambda s: s.queries),
+        ("db_queries_max", "gauge", "Most SQL statements seen in a single operation", lambda s: s.queries_max),
+        ("db_seconds_total", "counter", "Time spent executing SQL", lambda s: round(s.db_seconds, 6)),
+    )
+    for suffix, kind, help_text, value in families:
+        name = f"{prefix}_{suffix}"
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.extend(f"{name}{labels} {value(s)}" for labels, s in items)
+
+    name = f"{prefix}_duration_seconds"
+    lines.append(f"# HELP {name} Wall-clock duration")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, s in items:
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), s.buckets):
+            cumulative += count
+            lines.append(f'{name}_bucket{labels[:-1]},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{labels} {round(s.seconds, 6)}")
+        lines.append(f"{name}_count{labels} {s.count}")
+
+def _render_stats(lines: List[str], prefix: str, stats: dict):
+    # Numeric leaves of collect_stats() as untyped gauges; strings and lists are skipped
+    for key, value in stats.items():
+        name = _metric_name(prefix, key)
+        if isinstance(value, dict):
+            _render_stats(lines, name, value)
+        elif isinstance(value, (int, float)):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {float(value)}")
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    _render_operations(lines, "fixmate_http_requests", _routes, ("method", "route"))
+    _render_operations(lines, "fixmate_background_runs", _background, ("job",))
+    _render_stats(lines, "fixmate", collect_stats())
+    return "\n".join(lines) + "\n"
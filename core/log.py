@@ -1,8 +1,15 @@
 import logging
 import os
-import asyncio
+import sys
+import json
+import queue
+import threading
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler
+from core.config import settings
+from core.metrics import register_stats
+from core.alerts import alert_dispatcher
 
 # Ensure logs directory exists
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -10,27 +17,149 @@ LOG_DIR = os.path.join(BASE_DIR, "logs")
 if not os.path.exists(LOG_DIR):
     os.makedirs(LOG_DIR)
 
-# Setup basic file handler
-logging.basicConfig(
-    filename=os.path.join(LOG_DIR, "app.log"),
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S"
-)
+_log_counters = {"dropped": 0, "written": 0, "rotations": 0}
 
-# Internal logger for file operations to avoid recursion if we used our own class
-_file_logger = logging.getLogger("FixMate")
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller: when the queue is full the
+    record is counted and discarded.
+    """
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _log_counters["dropped"] += 1
 
-async def sendError(level: str, msg: str):
+class _JsonLinesFile:
     """
-    Placeholder for external notification logic.
+    Append-only JSON lines file with size-based rotation. Written in
+    binary so the size tracked is in bytes, like LOG_MAX_BYTES.
     """
-    try:
-        # In a real application, you would make an HTTP request here
-        # print(f"[{level.upper()} NOTIFICATION SENT]: {msg}")
-        pass
-    except Exception as e:
-        _file_logger.error(f"Failed to send notification: {e}")
+    def __init__(self, path: str, max_bytes: int, backup_count: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.stream = open(path, "ab")
+        self.size = self.stream.tell()
+
+    def write(self, lines):
+        data = "".join(lines).encode("utf-8")
+        if self.max_bytes and self.size and self.size + len(data) > self.max_bytes:
+            self.rotate()
+        self.stream.write(data)
+        self.stream.flush()
+        self.size += len(data)
+
+    def rotate(self):
+        self.stream.close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(self.path, f"{self.path}.1")
+        self.stream = open(self.path, "wb")
+        self.size = 0
+        _log_counters["rotations"] += 1
+
+    def close(self):
+        self.stream.close()
+
+class LogListener:
+    """
+    Background thread that drains the log queue in batches and does all
+    the I/O: one file write and one console write per batch.
+    """
+    _STOP = object()
+
+    def __init__(self, log_queue: queue.Queue, path: str):
+        self.queue = log_queue
+        self.file = _JsonLinesFile(path, settings.LOG_MAX_BYTES, settings.LOG_BACKUP_COUNT)
+        self.color = settings.LOG_CONSOLE_COLOR if settings.LOG_CONSOLE_COLOR is not None else settings.ENVIRONMENT != "production"
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread.is_alive():
+            return
+        # The sentinel must get in even if the queue is full
+        self.queue.put(self._STOP)
+        self._thread.join(timeout=5)
+        self.file.close()
+
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < settings.LOG_BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = any(record is self._STOP for record in batch)
+            records = [record for record in batch if record is not self._STOP]
+            try:
+                self._write(records)
+            except Exception:
+                # Logging must never take the process down
+                pass
+            if stopping:
+                return
+
+    def _write(self, records):
+        if not records:
+            return
+        lines = []
+        console = []
+        for record in records:
+            tag = getattr(record, "tag", None)
+            entry = {
+                "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+                "level": tag or record.levelname,
+                "logger": record.name,
+                "msg": record.getMessage(),
+            }
+            severity = getattr(record, "severity", None)
+            if severity is not None:
+                entry["severity"] = severity
+            lines.append(json.dumps(entry, default=str) + "\n")
+            # Only our own Logger calls go to the console, as before
+            if tag is not None and settings.LOG_CONSOLE:
+                timestamp = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S")
+                label = f"{tag} - {severity}" if severity else tag
+                text = f"{timestamp} - {label} - {entry['msg']}"
+                color = getattr(record, "color", "")
+                console.append(f"{color}{text}{Logger.StyleModifier.ENDC}\n" if self.color and color else text + "\n")
+
+        self.file.write(lines)
+        _log_counters["written"] += len(lines)
+        if console:
+            sys.stdout.write("".join(console))
+            sys.stdout.flush()
+
+_log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+_listener = LogListener(_log_queue, os.path.join(LOG_DIR, "app.log"))
+_listener.start()
+
+# Everything logged through the stdlib (ours and third-party) goes through
+# the queue; the request path only ever does a put_nowait.
+_root = logging.getLogger()
+_root.setLevel(logging.INFO)
+_root.addHandler(DroppingQueueHandler(_log_queue))
+
+# Internal logger for file operations to avoid recursion if we used our own class
+_file_logger = logging.getLogger("FixMate")
+
+def stop_logging():
+    """Flush queued records and stop the listener (called on shutdown)."""
+    _listener.stop()
+
+def logging_stats() -> dict:
+    return {**_log_counters, "queued": _log_queue.qsize()}
+
+register_stats("logging", logging_stats)
 
 class Logger:
     class StyleModifier:
@@ -48,22 +177,13 @@ class Logger:
         def _log(self, msg: str, level: str = "ERROR", color: str = None):
             if color is None:
                 color = Logger.StyleModifier.RED
-            
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            # Console output
-            print(f"{color}{timestamp} - ERROR - {level} - {msg}{Logger.StyleModifier.ENDC}")
-            # File output
-            _file_logger.error(f"[{level}] {msg}")
+            _file_logger.error(msg, extra={"tag": "ERROR", "severity": level, "color": color})
 
         def _trigger(self, severity: str, *args):
             msg = " ".join(str(a) for a in args)
             self._log(msg, level=severity.upper())
-            try:
-                loop = asyncio.get_running_loop()
-                loop.create_task(sendError(severity, msg))
-            except RuntimeError:
-                # No running loop, just skip notification or run sync if needed
-                pass
+            # Bounded and deduplicated; delivery happens on the dispatcher's flush
+            alert_dispatcher.submit(severity, msg)
 
         def __call__(self, *args):
             msg = " ".join(str(a) for a in args)
@@ -86,18 +206,11 @@ class Logger:
 
     def _print(self, color, level, *args):
         msg = " ".join(str(a) for a in args)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Console output
-        print(f"{color}{timestamp} - {level} - {msg}{Logger.StyleModifier.ENDC}")
-        
-        # File output mapping
-        if level == "INFO":
-            _file_logger.info(msg)
-        elif level == "WARN":
-            _file_logger.warning(msg)
-        elif level == "TRACK":
-            _file_logger.info(f"[TRACK] {msg}")
+        # Formatting and all I/O happen on the listener thread
+        if level == "WARN":
+            _file_logger.warning(msg, extra={"tag": level, "color": color})
+        else:
+            _file_logger.info(msg, extra={"tag": level, "color": color})
 
     def info(self, *args):
         self._print(Logger.StyleModifier.BLUE, "INFO", *args)
@@ -0,0 +1,14 @@
+from typing import Callable, Dict
+
+# name -> callable returning a flat dict of counters/gauges
+_collectors: Dict[str, Callable[[], dict]] = {}
+
+def register_stats(name: str, collector: Callable[[], dict]):
+    """
+    Register a subsystem's counters so they show up in the admin stats
+    endpoint. Registering the same name again replaces the collector.
+    """
+    _collectors[name] = collector
+
+def collect_stats() -> Dict[str, dict]:
+    return {name: collector() for name, collector in _collectors.items()}
@@ -0,0 +1,117 @@
+"""
+Versioned schema migrations for databases created before a model change.
+
+`create_all` only creates missing tables; it never adds a column or an
+index to a table that already exists. Each migration here brings an older
+database up to the current models and must be safe to run on a fresh one
+too (create_all has already built everything there). Applied versions
+are recorded in `schema_migrations`.
+"""
+from sqlalchemy import inspect, select, text, Column, Integer, DateTime, Table, MetaData
+from sqlalchemy.sql import func
+from core.database import Base
+from core.log import logger
+
+_migrations_table = Table(
+    "schema_migrations",
+    MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+def _add_column(conn, table_name: str, column_name: str):
+    existing = {col["name"] for col in inspect(conn).get_columns(table_name)}
+    if column_name in existing:
+        return
+    column = Base.metadata.tables[table_name].c[column_name]
+    ddl = f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column.type.compile(dialect=conn.dialect)}"
+    if column.server_default is not None:
+        # SQLite only accepts NOT NULL on an added column when it has a default
+        ddl += f" DEFAULT {column.server_default.arg}"
+        if not column.nullable:
+            ddl += " NOT NULL"
+    conn.execute(text(ddl))
+
+def _create_indexes(conn, *index_names: str):
+    wanted = set(index_names)
+    for table in Base.metadata.tables.values():
+        for index in table.indexes:
+            if index.name in wanted:
+                index.create(conn, checkfirst=True)
+                wanted.discard(index.name)
+    if wanted:
+        raise RuntimeError(f"Unknown indexes in migration: {sorted(wanted)}")
+
+def _001_coordinates(conn):
+    for table_name in ("jobs", "technicians"):
+        _add_column(conn, table_name, "latitude")
+        _add_column(conn, table_name, "longitude")
+
+def _002_hot_path_indexes(conn):
+    _create_indexes(
+        conn,
+        "ix_jobs_status_created",
+        "ix_job_offers_job_status_expires",
+        "ix_job_offers_technician_status",
+        "ix_technicians_verified_rating",
+        "ix_notifications_user_created",
+    )
+
+def _003_audit_log_indexes(conn):
+    _create_indexes(
+        conn,
+        "ix_audit_logs_created",
+        "ix_audit_logs_user_created",
+        "ix_audit_logs_action_created",
+    )
+
+def _004_job_list_indexes(conn):
+    _create_indexes(
+        conn,
+        "ix_jobs_customer_created",
+        "ix_jobs_technician_created",
+        "ix_jobs_created",
+    )
+
+def _005_job_version(conn):
+    _add_column(conn, "jobs", "version")
+
+def _006_technician_updated_at(conn):
+    # Existing rows stay NULL; they are covered by the index's initial full load
+    _add_column(conn, "technicians", "updated_at")
+    _create_indexes(conn, "ix_technicians_updated")
+
+def _007_backfill_notification_counters(conn):
+    # Counters only track changes made after the table appeared; rebuild
+    # them from the unread rows so existing badges start out right
+    counters = Base.metadata.tables["notification_counters"]
+    notifications = Base.metadata.tables["notifications"]
+    conn.execute(counters.delete())
+    conn.execute(counters.insert().from_select(
+        ["user_id", "unread"],
+        select(notifications.c.user_id, func.count())
+        .where(notifications.c.is_read == False)
+        .group_by(notifications.c.user_id),
+    ))
+
+# Append only; never renumber or edit a migration that has shipped
+MIGRATIONS = [
+    (1, _001_coordinates),
+    (2, _002_hot_path_indexes),
+    (3, _003_audit_log_indexes),
+    (4, _004_job_list_indexes),
+    (5, _005_job_version),
+    (6, _006_technician_updated_at),
+    (7, _007_backfill_notification_counters),
+]
+
+def run_migrations(conn):
+    """Apply pending migrations on a sync connection (use with run_sync)."""
+    _migrations_table.create(conn, checkfirst=True)
+    applied = set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+    for version, migration in MIGRATIONS:
+        if version in applied:
+            continue
+        migration(conn)
+        conn.execute(_migrations_table.insert().values(version=version))
+        logger.info(f"Applied migration {version}: {migration.__name__.lstrip('_')}")
@@ -0,0 +1,64 @@
+import base64
+import json
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException
+from sqlalchemy import String, and_, or_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(created_at: str, row_id: str) -> str:
+    raw = json.dumps([created_at, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[str, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(created_at), str(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_where(stmt, created_col, id_col, cursor: Optional[str]):
+    """
+    Restrict `stmt` to rows strictly after `cursor` in
+    (created_at DESC, id DESC) order.
+
+    The timestamp is compared as stored rather than as a bound datetime:
+    SQLite keeps server-default timestamps without microseconds while
+    SQLAlchemy binds them with, so a datetime comparison would make the
+    cursor row sort before itself.
+    """
+    if not cursor:
+        return stmt
+    created_at, row_id = decode_cursor(cursor)
+    raw_created = type_coerce(created_col, String)
+    return stmt.where(or_(raw_created < created_at, and_(raw_created == created_at, id_col < row_id)))
+
+async def fetch_page(
+    db: AsyncSession,
+    stmt,
+    created_col,
+    id_col,
+    cursor: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Run a keyset-paginated select of a single ORM entity, newest first.
+    Returns the page items and the cursor for the next page (None on the
+    last page). Fetches one extra row to know whether there is a next page.
+    """
+    stmt = (
+        keyset_where(stmt, created_col, id_col, cursor)
+        .add_columns(type_coerce(created_col, String).label("cursor_created_at"))
+        .order_by(created_col.desc(), id_col.desc())
+        .limit(limit + 1)
+    )
+    rows = (await db.execute(stmt)).all()
+    items = [row[0] for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last_item, last_created = rows[limit - 1]
+        next_cursor = encode_cursor(str(last_created), last_item.id)
+    return items, next_cursor
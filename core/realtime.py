@@ -0,0 +1,100 @@
+import asyncio
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Set
+from core.config import settings
+from core.metrics import register_stats
+
+class Subscription:
+    """One connected client: a bounded inbox plus the topics it follows."""
+    def __init__(self, topics: Iterable[str], max_queue: int):
+        self.topics = tuple(topics)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+class RealtimeHub:
+    """
+    In-process pub/sub between services/workers and push connections.
+
+    `publish` never awaits: each subscriber has a bounded inbox and a slow
+    client loses its oldest undelivered event rather than holding up the
+    publisher. Connections in other processes are not reached.
+    """
+    def __init__(self, max_queue: int = 100, latency_samples: int = 1024):
+        self.max_queue = max_queue
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._connections = 0
+        self._fanout_ms: Deque[float] = deque(maxlen=latency_samples)
+        self._delivery_ms: Deque[float] = deque(maxlen=latency_samples)
+        self.counters = {"published": 0, "delivered": 0, "dropped": 0}
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(topics, self.max_queue)
+        for topic in subscription.topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+        self._connections += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._topics[topic]
+        self._connections -= 1
+
+    def publish(self, topic: str, event: dict):
+        subscribers = self._topics.get(topic)
+        self.counters["published"] += 1
+        if not subscribers:
+            return
+        start = time.perf_counter()
+        message = {**event, "topic": topic, "_published_at": start}
+        for subscription in subscribers:
+            queue = subscription.queue
+            if queue.full():
+                queue.get_nowait()
+                subscription.dropped += 1
+                self.counters["dropped"] += 1
+            queue.put_nowait(message)
+        self._fanout_ms.append((time.perf_counter() - start) * 1000)
+
+    def delivered(self, message: dict):
+        """Record end-to-end latency once a message has been sent to a client."""
+        self.counters["delivered"] += 1
+        published_at = message.get("_published_at")
+        if published_at is not None:
+            self._delivery_ms.append((time.perf_counter() - published_at) * 1000)
+
+    @staticmethod
+    def _percentile(samples: Deque[float], q: float) -> float:
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 3)
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "connections": self._connections,
+            "topics": len(self._topics),
+            "fanout_ms_p50": self._percentile(self._fanout_ms, 0.5),
+            "fanout_ms_p99": self._percentile(self._fanout_ms, 0.99),
+            "delivery_ms_p50": self._percentile(self._delivery_ms, 0.5),
+            "delivery_ms_p99": self._percentile(self._delivery_ms, 0.99),
+        }
+
+def user_topic(user_id: str) -> str:
+    return f"user:{user_id}"
+
+def technician_topic(technician_id: str) -> str:
+    return f"technician:{technician_id}"
+
+hub = RealtimeHub(max_queue=settings.REALTIME_CLIENT_QUEUE_SIZE)
+
+register_stats("realtime", hub.stats)
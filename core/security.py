@@ -1,8 +1,12 @@
 from passlib.context import CryptContext
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt
+import asyncio
 from core.config import settings
+from core.exceptions import ServiceUnavailableException
+from core.metrics import register_stats
 
 pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
 
@@ -12,6 +16,59 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+# pbkdf2 is CPU bound; running it on the event loop stalls every other
+# request, so the async variants below hand it to a small process pool.
+_hash_pool: Optional[ProcessPoolExecutor] = None
+_hash_counters = {"in_flight": 0, "completed": 0, "failed": 0, "rejected": 0}
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+    return _hash_pool
+
+def shutdown_hash_pool():
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+async def _run_hashing(fn, *args):
+    # Busy workers plus a bounded backlog; anything beyond that is shed
+    # instead of queueing up behind a login storm.
+    limit = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_DEPTH
+    if _hash_counters["in_flight"] >= limit:
+        _hash_counters["rejected"] += 1
+        raise ServiceUnavailableException("Authentication is busy, retry shortly")
+
+    _hash_counters["in_flight"] += 1
+    try:
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(_get_hash_pool(), fn, *args)
+    except BaseException:
+        # Includes cancellation and a broken pool
+        _hash_counters["failed"] += 1
+        raise
+    finally:
+        _hash_counters["in_flight"] -= 1
+    _hash_counters["completed"] += 1
+    return result
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_hashing(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_hashing(get_password_hash, password)
+
+def hashing_stats() -> dict:
+    return {
+        **_hash_counters,
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "queue_depth": settings.PASSWORD_HASH_QUEUE_DEPTH,
+    }
+
+register_stats("password_hashing", hashing_stats)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
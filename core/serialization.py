@@ -0,0 +1,19 @@
+from typing import Any, Mapping, Optional
+from fastapi import Response
+from pydantic import TypeAdapter
+
+class Serializer:
+    """
+    ORM objects -> JSON bytes for one response schema, with the pydantic
+    adapter built once at import time. Endpoints that return a lot of rows
+    hand back `serializer.response(rows)` instead of going through
+    response_model (which they keep for the OpenAPI docs).
+    """
+    def __init__(self, schema: Any):
+        self.adapter = TypeAdapter(schema)
+
+    def dumps(self, data: Any) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(data, from_attributes=True))
+
+    def response(self, data: Any, status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> Response:
+        return Response(content=self.dumps(data), status_code=status_code, media_type="application/json", headers=headers)
@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Depends
+from fastapi.responses import PlainTextResponse
 from core.config import settings
 from modules.auth.router import router as auth_router
 from modules.users.router import router as users_router
@@ -8,11 +9,25 @@ from modules.reviews.router import router as reviews_router
 from modules.disputes.router import router as disputes_router
 from modules.notifications.router import router as notifications_router
 from modules.admin.router import router as admin_router
-from core.database import engine, Base
+from modules.realtime.router import router as realtime_router
+import modules.payments.models  # No router yet; registers the table for create_all
+from core.database import engine, Base, get_db
+from core.migrations import run_migrations
 from contextlib import asynccontextmanager
 
 from workers.matching import run_matching_worker
+from workers.notifications import run_notification_worker
+from core.security import shutdown_hash_pool
+from core.log import stop_logging
+from core.alerts import alert_dispatcher
+from modules.admin.audit import audit_sink
+from core.instrumentation import MetricsMiddleware, render_prometheus
 import asyncio
+import hmac
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.exceptions import CredentialsException, PermissionDeniedException
+from modules.auth.dependencies import authenticate_token
+from shared.enums import UserRole
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -24,18 +39,32 @@ async def lifespan(app: FastAPI):
     # Create tables on startup
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        # Columns and indexes that create_all won't add to existing tables
+        await conn.run_sync(run_migrations)
     
-    # Start background worker
-    worker_task = asyncio.create_task(run_matching_worker())
+    # Start background workers
+    worker_tasks = [
+        asyncio.create_task(run_matching_worker()),
+        asyncio.create_task(run_notification_worker()),
+    ]
+    alert_dispatcher.start()
+    audit_sink.start()
     
     yield
     
     # Cleanup
-    worker_task.cancel()
-    try:
-        await worker_task
-    except asyncio.CancelledError:
-        pass
+    for task in worker_tasks:
+        task.cancel()
+    for task in worker_tasks:
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    # Write out buffered audit rows before anything else shuts down
+    await audit_sink.stop()
+    await alert_dispatcher.stop()
+    shutdown_hash_pool()
+    stop_logging()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -56,6 +85,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    # Added last so it wraps everything else and times the whole request
+    app.add_middleware(MetricsMiddleware)
+
 from core.log import logger
 from fastapi import Request
 
@@ -72,7 +105,27 @@ app.include_router(reviews_router, prefix=settings.API_PREFIX)
 app.include_router(disputes_router, prefix=settings.API_PREFIX)
 app.include_router(notifications_router, prefix=settings.API_PREFIX)
 app.include_router(admin_router, prefix=settings.API_PREFIX)
+app.include_router(realtime_router, prefix=settings.API_PREFIX)
 
 @app.get("/")
 async def root():
     return {"message": "Welcome to FixMate API"}
+
+async def _authorize_metrics(request: Request, db: AsyncSession):
+    # Same audience as /admin/stats: the scrape token or an admin login
+    auth = request.headers.get("authorization", "")
+    if settings.METRICS_TOKEN and hmac.compare_digest(auth.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+        return
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise CredentialsException()
+    user = await authenticate_token(db, token)
+    if user.role != UserRole.ADMIN:
+        raise PermissionDeniedException()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request, db: AsyncSession = Depends(get_db)):
+    # Prometheus text format; per-route SQL/latency plus everything in /admin/stats
+    if not settings.METRICS_PUBLIC:
+        await _authorize_metrics(request, db)
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
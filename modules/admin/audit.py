@@ -0,0 +1,85 @@
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Deque
+from sqlalchemy import insert
+from core.config import settings
+from core.batching import BatchFlusher
+from core.database import SessionLocal
+from core.metrics import register_stats
+from modules.admin import models
+
+_file_logger = logging.getLogger("FixMate")
+
+class AuditSink(BatchFlusher):
+    """
+    Bounded in-memory buffer of audit rows, written in bulk INSERTs of
+    `batch_size`. Overflow and rows that keep failing go to the app log.
+    """
+    def __init__(self, max_buffer: int = 5000, batch_size: int = 200, flush_interval: float = 2.0, max_retries: int = 3):
+        super().__init__(flush_interval)
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+
+        self._buffer: Deque[dict] = deque()
+        self._head_failures = 0 # Consecutive failed attempts for the batch at the front
+        self.counters = {"recorded": 0, "written": 0, "overflowed": 0, "batches": 0, "failures": 0, "discarded": 0}
+
+    def record(self, user_id: str, action: str, details: str = ""):
+        """Queue an audit row. Never blocks and never touches the DB."""
+        if len(self._buffer) >= self.max_buffer:
+            self.counters["overflowed"] += 1
+            _file_logger.error(f"Audit buffer full, not stored: {action} by {user_id}: {details}")
+            return
+        self.counters["recorded"] += 1
+        # Stamped now, not at flush time
+        self._buffer.append({"user_id": user_id, "action": action, "details": details, "created_at": datetime.utcnow()})
+        if len(self._buffer) >= self.batch_size:
+            self._signal()
+
+    async def _write(self, rows):
+        async with SessionLocal() as db:
+            await db.execute(insert(models.AuditLog), rows)
+            await db.commit()
+
+    async def flush(self):
+        while self._buffer:
+            batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+            try:
+                await self._write(batch)
+                self.counters["written"] += len(batch)
+                self.counters["batches"] += 1
+                self._head_failures = 0
+            except Exception as e:
+                self.counters["failures"] += 1
+                self._head_failures += 1
+                _file_logger.error(f"Failed to write audit batch (attempt {self._head_failures}): {e}")
+                if self._head_failures < self.max_retries:
+                    # Put the batch back in order and retry on the next flush
+                    self._buffer.extendleft(reversed(batch))
+                    return
+                self._head_failures = 0
+                await self._write_rows(batch)
+
+    async def _write_rows(self, batch):
+        # Isolate the bad rows; everything else still lands in the table
+        for row in batch:
+            try:
+                await self._write([row])
+                self.counters["written"] += 1
+            except Exception as e:
+                self.counters["discarded"] += 1
+                _file_logger.error(f"Audit row not stored ({e}): {row}")
+
+    def stats(self) -> dict:
+        return {**self.counters, "buffered": len(self._buffer), "capacity": self.max_buffer}
+
+audit_sink = AuditSink(
+    max_buffer=settings.AUDIT_BUFFER_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    flush_interval=settings.AUDIT_FLUSH_INTERVAL_SECONDS,
+    max_retries=settings.AUDIT_MAX_RETRIES,
+)
+
+register_stats("audit", audit_sink.stats)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime, Text
+from sqlalchemy import Column, String, ForeignKey, DateTime, Text, Index
 from sqlalchemy.sql import func
 from core.database import Base
 from modules.auth.models import generate_uuid
@@ -11,3 +11,11 @@ class AuditLog(Base):
     action = Column(String, nullable=False)
     details = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Log pages and export: ORDER BY created_at DESC, id DESC, optionally
+        # filtered by user or action
+        Index("ix_audit_logs_created", "created_at", "id"),
+        Index("ix_audit_logs_user_created", "user_id", "created_at", "id"),
+        Index("ix_audit_logs_action_created", "action", "created_at", "id"),
+    )
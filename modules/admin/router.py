@@ -1,18 +1,57 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Literal, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from core.database import get_db
-from modules.admin import models, schemas
+from core.database import get_db, get_read_db
+from modules.admin import models, schemas, service
 from modules.auth.models import User
 from core.rbac import require_role
 from shared.enums import UserRole
+from core.metrics import collect_stats
+from core.serialization import Serializer
+from core.pagination import MAX_PAGE_SIZE
+from shared.schemas import CursorPage
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
-@router.get("/logs", response_model=list[schemas.AuditLogResponse])
+audit_log_serializer = Serializer(CursorPage[schemas.AuditLogResponse])
+
+@router.get("/logs", response_model=CursorPage[schemas.AuditLogResponse])
 async def get_audit_logs(
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    user_id: Optional[str] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN))
+):
+    items, next_cursor = await service.list_audit_logs(db, cursor, limit, user_id, action, since, until)
+    return audit_log_serializer.response({"items": items, "next_cursor": next_cursor})
+
+@router.get("/logs/export")
+async def export_audit_logs(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    user_id: Optional[str] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    current_user: User = Depends(require_role(UserRole.ADMIN))
+):
+    # Rows are streamed from a server-side cursor; memory stays flat
+    # however much history matches
+    if format == "csv":
+        body, media_type = service.export_csv(user_id, action, since, until), "text/csv"
+    else:
+        body, media_type = service.export_ndjson(user_id, action, since, until), "application/x-ndjson"
+    filename = f"audit_logs.{format}"
+    return StreamingResponse(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@router.get("/stats")
+async def get_stats(
     current_user: User = Depends(require_role(UserRole.ADMIN))
 ):
-    result = await db.execute(select(models.AuditLog).order_by(models.AuditLog.created_at.desc()))
-    return result.scalars().all()
+    return collect_stats()
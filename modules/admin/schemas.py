@@ -1,11 +1,12 @@
 from pydantic import BaseModel
 from datetime import datetime
+from typing import Optional
 
 class AuditLogResponse(BaseModel):
     id: str
     user_id: str
     action: str
-    details: str
+    details: Optional[str] = None
     created_at: datetime
     class Config:
         from_attributes = True
@@ -1,7 +1,81 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, Optional
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import ReadSessionLocal
+from core.pagination import fetch_page
 from modules.admin import models
+from modules.admin.audit import audit_sink
 
-async def log_admin_action(db: AsyncSession, user_id: str, action: str, details: str = ""):
-    log = models.AuditLog(user_id=user_id, action=action, details=details)
-    db.add(log)
-    await db.commit()
+EXPORT_CHUNK_SIZE = 1000
+EXPORT_COLUMNS = ["id", "user_id", "action", "details", "created_at"]
+
+def log_admin_action(user_id: str, action: str, details: str = ""):
+    # Buffered; written in bulk by the audit sink, outside the request's transaction
+    audit_sink.record(user_id, action, details)
+
+def _filtered(stmt, user_id: Optional[str], action: Optional[str], since: Optional[datetime], until: Optional[datetime]):
+    if user_id:
+        stmt = stmt.where(models.AuditLog.user_id == user_id)
+    if action:
+        stmt = stmt.where(models.AuditLog.action == action)
+    if since:
+        stmt = stmt.where(models.AuditLog.created_at >= since)
+    if until:
+        stmt = stmt.where(models.AuditLog.created_at < until)
+    return stmt
+
+async def list_audit_logs(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    user_id: Optional[str] = None,
+    action: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    query = _filtered(select(models.AuditLog), user_id, action, since, until)
+    return await fetch_page(db, query, models.AuditLog.created_at, models.AuditLog.id, cursor, limit)
+
+async def _stream_rows(user_id, action, since, until) -> AsyncIterator[list]:
+    """
+    Yield matching rows newest first, EXPORT_CHUNK_SIZE at a time, from a
+    server-side cursor. Uses its own session: the export outlives the
+    request's dependencies while the body is being streamed.
+    """
+    columns = [getattr(models.AuditLog, name) for name in EXPORT_COLUMNS]
+    stmt = (
+        _filtered(select(*columns), user_id, action, since, until)
+        .order_by(models.AuditLog.created_at.desc(), models.AuditLog.id.desc())
+        .execution_options(yield_per=EXPORT_CHUNK_SIZE)
+    )
+    async with ReadSessionLocal() as db:
+        result = await db.stream(stmt)
+        async for partition in result.partitions():
+            yield partition
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+async def export_ndjson(user_id=None, action=None, since=None, until=None) -> AsyncIterator[bytes]:
+    async for rows in _stream_rows(user_id, action, since, until):
+        yield "".join(
+            json.dumps({name: _json_value(value) for name, value in zip(EXPORT_COLUMNS, row)}) + "\n"
+            for row in rows
+        ).encode()
+
+async def export_csv(user_id=None, action=None, since=None, until=None) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    async for rows in _stream_rows(user_id, action, since, until):
+        writer.writerows([_json_value(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only, nothing matched
+        yield buffer.getvalue().encode()
@@ -2,15 +2,76 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import event, inspect
 from core.config import settings
 from core.database import get_db
+from core.cache import TTLCache
+from core.metrics import register_stats
 from modules.auth import models, schemas
+from modules.users.models import Technician
+from shared.enums import UserRole
 from core.exceptions import CredentialsException, NotFoundException, PermissionDeniedException # PermissionDeniedException for rbac later
 from sqlalchemy import select
+from typing import Optional, Tuple
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_PREFIX}/auth/login")
 
+# (User, Technician or None) keyed by token subject (email). Entries are
+# detached instances, so only column attributes may be read from them.
+principal_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_SIZE, ttl=settings.AUTH_CACHE_TTL_SECONDS)
+_auth_counters = {"requests": 0, "db_lookups": 0, "stateless": 0}
+
+def invalidate_principal(email: str):
+    principal_cache.invalidate(email)
+
+@event.listens_for(models.User.is_active, "set")
+@event.listens_for(models.User.role, "set")
+def _on_principal_changed(target, value, oldvalue, initiator):
+    # Deactivation or a role change must not be served from cache. Only
+    # loaded rows count; transient principals (stateless mode) set these too
+    if not inspect(target).persistent:
+        return
+    if target.email:
+        invalidate_principal(target.email)
+
+def auth_stats() -> dict:
+    requests = _auth_counters["requests"]
+    return {
+        **_auth_counters,
+        "db_hit_ratio": round(_auth_counters["db_lookups"] / requests, 4) if requests else 0.0,
+        "cache": principal_cache.stats(),
+    }
+
+register_stats("auth", auth_stats)
+
+async def _load_principal(db: AsyncSession, email: str) -> Tuple[models.User, Optional[Technician]]:
+    """
+    User and technician profile (if any) for a token subject, fetched with
+    one outer join and kept in `principal_cache` as a pair.
+    """
+    entry = principal_cache.get(email)
+    if entry is None:
+        _auth_counters["db_lookups"] += 1
+        result = await db.execute(
+            select(models.User, Technician)
+            .outerjoin(Technician, Technician.user_id == models.User.id)
+            .where(models.User.email == email)
+        )
+        row = result.first()
+        if row is None:
+            raise CredentialsException()
+        entry = (row[0], row[1])
+        principal_cache.set(email, entry)
+    return entry
+
 async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> models.User:
+    return await authenticate_token(db, token)
+
+async def authenticate_token(db: AsyncSession, token: str) -> models.User:
+    """
+    Resolve a bearer token to its user. Shared by `get_current_user` and
+    transports that cannot use the Authorization header (WebSocket).
+    """
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         email: str = payload.get("sub")
@@ -19,10 +80,36 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         token_data = schemas.TokenData(email=email)
     except JWTError:
         raise CredentialsException()
-    
-    result = await db.execute(select(models.User).where(models.User.email == token_data.email))
-    user = result.scalars().first()
-    
-    if user is None:
-        raise CredentialsException()
+
+    _auth_counters["requests"] += 1
+
+    # Stateless mode trusts the identity and role claims signed at login
+    if settings.AUTH_STATELESS and payload.get("uid") and payload.get("role"):
+        _auth_counters["stateless"] += 1
+        return models.User(
+            id=payload["uid"],
+            email=token_data.email,
+            role=UserRole(payload["role"]),
+            is_active=True,
+        )
+
+    user, _ = await _load_principal(db, token_data.email)
+    if not user.is_active:
+        raise CredentialsException("Inactive user")
     return user
+
+async def load_technician(db: AsyncSession, user: models.User) -> Optional[Technician]:
+    """Technician profile of `user`, served from the principal cache."""
+    _, technician = await _load_principal(db, user.email)
+    return technician
+
+async def get_current_technician(
+    current_user: models.User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> Technician:
+    if current_user.role != UserRole.TECHNICIAN:
+        raise PermissionDeniedException()
+    technician = await load_technician(db, current_user)
+    if technician is None:
+        raise NotFoundException("Technician profile not found")
+    return technician
@@ -32,7 +32,7 @@ async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSessi
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    access_token = create_access_token(data={"sub": user.email, "role": user.role.value}) # Include role in token
+    access_token = create_access_token(data={"sub": user.email, "uid": user.id, "role": user.role.value}) # Include role in token
     refresh_token = create_refresh_token(data={"sub": user.email})
     logger.info(f"User logged in: {user.email}")
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
@@ -49,7 +49,7 @@ async def refresh_token(request: schemas.RefreshTokenRequest, db: AsyncSession =
         if not user:
              raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
         
-        access_token = create_access_token(data={"sub": user.email, "role": user.role.value})
+        access_token = create_access_token(data={"sub": user.email, "uid": user.id, "role": user.role.value})
         new_refresh_token = create_refresh_token(data={"sub": user.email})
         return {"access_token": access_token, "refresh_token": new_refresh_token, "token_type": "bearer"}
     except Exception: # generic catch for jose.JWTError but need import
@@ -1,15 +1,16 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from modules.auth import models, schemas
-from core.security import get_password_hash, verify_password
+from core.security import get_password_hash_async, verify_password_async
 from shared.enums import UserRole
+from core.database import save
 
 async def get_user_by_email(db: AsyncSession, email: str):
     result = await db.execute(select(models.User).where(models.User.email == email))
     return result.scalars().first()
 
 async def create_user(db: AsyncSession, user: schemas.UserCreate):
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     # Technician registers as PENDING implicitly? Plan says "Technician registers as PENDING".
     # But UserRole is TECHNICIAN.
     # Step 5 mentions "Technician cannot be matched unless verified".
@@ -28,15 +29,12 @@ async def create_user(db: AsyncSession, user: schemas.UserCreate):
         role=user.role,
         is_active=True
     )
-    db.add(db_user)
-    await db.commit()
-    await db.refresh(db_user)
-    return db_user
+    return await save(db, db_user)
 
 async def authenticate_user(db: AsyncSession, email: str, password: str):
     user = await get_user_by_email(db, email)
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return False
     return user
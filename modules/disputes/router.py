@@ -6,6 +6,7 @@ from modules.auth.models import User
 from core.rbac import require_role
 from shared.enums import UserRole
 from core.log import logger
+from modules.admin.service import log_admin_action
 
 router = APIRouter(prefix="/disputes", tags=["Disputes"])
 
@@ -27,5 +28,6 @@ async def resolve_dispute_endpoint(
     current_user: User = Depends(require_role(UserRole.ADMIN))
 ):
     dispute = await service.resolve_dispute(db, dispute_id, resolve_in, current_user.id)
+    log_admin_action(current_user.id, "RESOLVE_DISPUTE", f"dispute={dispute_id} outcome={resolve_in.outcome}")
     logger.track(f"Dispute {dispute_id} resolved as {resolve_in.outcome} by ADMIN {current_user.email}")
     return dispute
@@ -5,6 +5,7 @@ from modules.jobs import models as job_models
 from shared.enums import DisputeStatus
 from fastapi import HTTPException
 from datetime import datetime
+from core.database import save
 
 async def create_dispute(db: AsyncSession, user_id: str, dispute_in: schemas.DisputeCreate):
     # Check if job exists
@@ -22,10 +23,7 @@ async def create_dispute(db: AsyncSession, user_id: str, dispute_in: schemas.Dis
         reason=dispute_in.reason,
         status=DisputeStatus.OPEN
     )
-    db.add(dispute)
-    await db.commit()
-    await db.refresh(dispute)
-    return dispute
+    return await save(db, dispute)
 
 async def resolve_dispute(db: AsyncSession, dispute_id: str, resolve_in: schemas.DisputeResolve, admin_id: str):
     dispute = await db.scalar(select(models.Dispute).where(models.Dispute.id == dispute_id))
@@ -36,8 +34,4 @@ async def resolve_dispute(db: AsyncSession, dispute_id: str, resolve_in: schemas
     dispute.resolution_notes = resolve_in.notes
     dispute.resolved_at = datetime.utcnow()
     
-    # Log admin action (todo)
-    
-    await db.commit()
-    await db.refresh(dispute)
-    return dispute
+    return await save(db, dispute)
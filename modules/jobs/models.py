@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Enum as SQLEnum, DateTime, Float
+from sqlalchemy import Column, String, ForeignKey, Enum as SQLEnum, DateTime, Float, Index, Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import Base
@@ -14,9 +14,12 @@ class Job(Base):
     service_id = Column(String, ForeignKey("services.id"), nullable=False)
     
     status = Column(SQLEnum(JobStatus), default=JobStatus.REQUESTED, nullable=False)
+    version = Column(Integer, default=1, server_default="1", nullable=False) # Bumped by every status transition
     
     description = Column(String, nullable=True)
     location = Column(String, nullable=False) # Simplified for now
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     
     # Pricing snapshot
     estimated_price = Column(Float, nullable=True)
@@ -29,6 +32,15 @@ class Job(Base):
     service = relationship("modules.services.models.Service")
     offers = relationship("JobOffer", back_populates="job")
 
+    __table_args__ = (
+        # Matching sweep: WHERE status = ? ORDER BY created_at
+        Index("ix_jobs_status_created", "status", "created_at"),
+        # Job lists, newest first: per customer, per technician, all (admin)
+        Index("ix_jobs_customer_created", "customer_id", "created_at", "id"),
+        Index("ix_jobs_technician_created", "technician_id", "created_at", "id"),
+        Index("ix_jobs_created", "created_at", "id"),
+    )
+
 class JobOffer(Base):
     __tablename__ = "job_offers"
 
@@ -42,3 +54,10 @@ class JobOffer(Base):
 
     job = relationship("Job", back_populates="offers")
     technician = relationship("modules.users.models.Technician")
+
+    __table_args__ = (
+        # Offers per job (matching, expiry sweep)
+        Index("ix_job_offers_job_status_expires", "job_id", "status", "expires_at"),
+        # Accept/reject and technician load
+        Index("ix_job_offers_technician_status", "technician_id", "status"),
+    )
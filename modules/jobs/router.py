@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from core.database import get_db
+from core.database import get_db, get_read_db
 from modules.jobs import models, schemas, service
 from modules.auth.models import User
 from core.rbac import require_role
+from modules.auth.dependencies import get_current_technician, load_technician
+from modules.users.models import Technician
 from shared.enums import UserRole
 from core.log import logger
+from core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from core.serialization import Serializer
+from shared.enums import JobStatus, JobOfferStatus
+from shared.schemas import CursorPage
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
+job_page_serializer = Serializer(CursorPage[schemas.JobResponse])
+offer_page_serializer = Serializer(CursorPage[schemas.JobOfferResponse])
+batch_serializer = Serializer(schemas.JobBatchGetResponse)
+
 @router.post("/", response_model=schemas.JobResponse)
 async def create_job(
     job_in: schemas.JobCreate,
@@ -19,10 +30,81 @@ async def create_job(
     logger.track(f"Job created: {job.id} by Customer {current_user.email}")
     return job
 
+# List routes must be declared before /{job_id}
+
+@router.get("/", response_model=CursorPage[schemas.JobResponse])
+async def list_all_jobs(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[JobStatus] = None,
+    service_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN))
+):
+    items, next_cursor = await service.list_jobs(db, cursor, limit, status=status, service_id=service_id)
+    return job_page_serializer.response({"items": items, "next_cursor": next_cursor})
+
+@router.get("/mine", response_model=CursorPage[schemas.JobResponse])
+async def list_my_jobs(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[JobStatus] = None,
+    service_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_role(UserRole.CUSTOMER))
+):
+    items, next_cursor = await service.list_jobs(
+        db, cursor, limit, customer_id=current_user.id, status=status, service_id=service_id
+    )
+    return job_page_serializer.response({"items": items, "next_cursor": next_cursor})
+
+@router.get("/assigned", response_model=CursorPage[schemas.JobResponse])
+async def list_assigned_jobs(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: Optional[JobStatus] = None,
+    service_id: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    tech: Technician = Depends(get_current_technician)
+):
+    items, next_cursor = await service.list_jobs(
+        db, cursor, limit, technician_id=tech.id, status=status, service_id=service_id
+    )
+    return job_page_serializer.response({"items": items, "next_cursor": next_cursor})
+
+@router.get("/offers", response_model=CursorPage[schemas.JobOfferResponse])
+async def list_my_offers(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    status: JobOfferStatus = JobOfferStatus.PENDING,
+    db: AsyncSession = Depends(get_read_db),
+    tech: Technician = Depends(get_current_technician)
+):
+    items, next_cursor = await service.list_offers(db, tech.id, cursor, limit, status)
+    return offer_page_serializer.response({"items": items, "next_cursor": next_cursor})
+
+@router.post("/batch-get", response_model=schemas.JobBatchGetResponse)
+async def batch_get_jobs(
+    batch_in: schemas.JobBatchGetRequest,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(require_role(UserRole.CUSTOMER, UserRole.TECHNICIAN, UserRole.ADMIN))
+):
+    customer_id = technician_id = None
+    if current_user.role == UserRole.CUSTOMER:
+        customer_id = current_user.id
+    elif current_user.role == UserRole.TECHNICIAN:
+        tech = await load_technician(db, current_user)
+        if not tech:
+            raise HTTPException(status_code=404, detail="Technician profile not found")
+        technician_id = tech.id
+
+    items, missing = await service.get_jobs_for_user(db, batch_in.ids, customer_id, technician_id)
+    return batch_serializer.response({"items": items, "missing": missing})
+
 @router.get("/{job_id}", response_model=schemas.JobResponse)
 async def get_job_endpoint(
     job_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_role(UserRole.CUSTOMER, UserRole.TECHNICIAN, UserRole.ADMIN))
 ):
     job = await service.get_job(db, job_id)
@@ -35,35 +117,36 @@ async def get_job_endpoint(
 async def accept_job(
     job_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.TECHNICIAN))
+    tech: Technician = Depends(get_current_technician)
 ):
-    # Logic to find offer... (simplified from previous step)
-    tech = current_user.technician_profile[0]
-    from sqlalchemy import select
-    from modules.jobs.models import JobOffer
-    from shared.enums import JobOfferStatus
-
-    result = await db.execute(select(JobOffer).where(
-        JobOffer.job_id == job_id,
-        JobOffer.technician_id == tech.id,
-        JobOffer.status == JobOfferStatus.PENDING
-    ))
-    offer = result.scalars().first()
-    if not offer:
-        logger.warn(f"Job accept failed: No active offer - Job {job_id}, Tech {tech.id}")
-        raise HTTPException(status_code=400, detail="No active offer found")
-    
-    job = await service.accept_job_offer(db, offer.id, tech.id)
+    try:
+        job = await service.accept_job_offer(db, job_id, tech.id)
+    except HTTPException as e:
+        logger.warn(f"Job accept failed: {e.detail} - Job {job_id}, Tech {tech.id}")
+        raise
     logger.info(f"Job accepted: {job.id} by Tech {tech.id}")
     return job
 
+@router.post("/{job_id}/reject", response_model=schemas.JobOfferResponse)
+async def reject_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+    tech: Technician = Depends(get_current_technician)
+):
+    try:
+        offer = await service.reject_job_offer(db, job_id, tech.id)
+    except HTTPException as e:
+        logger.warn(f"Job reject failed: {e.detail} - Job {job_id}, Tech {tech.id}")
+        raise
+    logger.info(f"Job offer rejected: {job_id} by Tech {tech.id}")
+    return offer
+
 @router.post("/{job_id}/start", response_model=schemas.JobResponse)
 async def start_job_endpoint(
     job_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.TECHNICIAN))
+    tech: Technician = Depends(get_current_technician)
 ):
-    tech = current_user.technician_profile[0]
     job = await service.start_job(db, job_id, tech.id)
     logger.info(f"Job started: {job_id}")
     return job
@@ -72,9 +155,8 @@ async def start_job_endpoint(
 async def complete_job_endpoint(
     job_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(require_role(UserRole.TECHNICIAN))
+    tech: Technician = Depends(get_current_technician)
 ):
-    tech = current_user.technician_profile[0]
     job = await service.complete_job(db, job_id, tech.id)
     logger.track(f"Job completed: {job_id} by Tech {tech.id}")
     return job
@@ -85,8 +167,8 @@ async def cancel_job_endpoint(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role(UserRole.CUSTOMER, UserRole.TECHNICIAN, UserRole.ADMIN))
 ):
-    tech_id = current_user.technician_profile[0].id if current_user.role == UserRole.TECHNICIAN and current_user.technician_profile else None
-    uid = tech_id if current_user.role == UserRole.TECHNICIAN else current_user.id
+    tech = await load_technician(db, current_user) if current_user.role == UserRole.TECHNICIAN else None
+    uid = (tech.id if tech else None) if current_user.role == UserRole.TECHNICIAN else current_user.id
     
     job = await service.cancel_job(db, job_id, uid, current_user.role)
     logger.warn(f"Job cancelled: {job_id} by {current_user.email} [{current_user.role}]")
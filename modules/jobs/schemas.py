@@ -1,12 +1,14 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from datetime import datetime
-from shared.enums import JobStatus
+from shared.enums import JobStatus, JobOfferStatus
 
 class JobBase(BaseModel):
     service_id: str
     description: Optional[str] = None
     location: str
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class JobCreate(JobBase):
     pass
@@ -16,7 +18,26 @@ class JobResponse(JobBase):
     customer_id: str
     technician_id: Optional[str] = None
     status: JobStatus
+    version: int
     created_at: datetime
     
     class Config:
         from_attributes = True
+
+class JobBatchGetRequest(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=500)
+
+class JobBatchGetResponse(BaseModel):
+    items: List[JobResponse] # In request order
+    missing: List[str] = [] # Unknown ids and jobs the caller may not see
+
+class JobOfferResponse(BaseModel):
+    id: str
+    job_id: str
+    technician_id: str
+    status: JobOfferStatus
+    created_at: datetime
+    expires_at: datetime
+
+    class Config:
+        from_attributes = True
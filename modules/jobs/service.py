@@ -1,145 +1,272 @@
+from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, or_
 from modules.jobs import models, schemas
 from shared.enums import JobStatus, JobOfferStatus
 from fastapi import HTTPException
 from datetime import datetime
+from workers.queue import matching_queue
+from modules.notifications.service import enqueue_notification
+from core.realtime import hub, user_topic, technician_topic
+from core.pagination import fetch_page
+from core.database import save
+
+def publish_status(job: models.Job):
+    """Push a committed status change to the job's customer and technician."""
+    # `version` lets clients drop events that arrive out of order
+    event = {"type": "job.status_changed", "job_id": job.id, "status": job.status.value, "version": job.version}
+    hub.publish(user_topic(job.customer_id), event)
+    if job.technician_id:
+        hub.publish(technician_topic(job.technician_id), event)
 
 async def get_job(db: AsyncSession, job_id: str):
     result = await db.execute(select(models.Job).where(models.Job.id == job_id))
     return result.scalars().first()
 
+async def list_jobs(
+    db: AsyncSession,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    customer_id: Optional[str] = None,
+    technician_id: Optional[str] = None,
+    status: Optional[JobStatus] = None,
+    service_id: Optional[str] = None,
+):
+    query = select(models.Job)
+    if customer_id:
+        query = query.where(models.Job.customer_id == customer_id)
+    if technician_id:
+        query = query.where(models.Job.technician_id == technician_id)
+    if status:
+        query = query.where(models.Job.status == status)
+    if service_id:
+        query = query.where(models.Job.service_id == service_id)
+    return await fetch_page(db, query, models.Job.created_at, models.Job.id, cursor, limit)
+
+async def get_jobs_for_user(
+    db: AsyncSession,
+    job_ids: list,
+    customer_id: Optional[str] = None,
+    technician_id: Optional[str] = None,
+):
+    """
+    Jobs among `job_ids` visible to the caller, in the order asked for,
+    plus the ids that were unknown or not visible. One query for the lot.
+    Pass neither customer_id nor technician_id for admin access.
+    """
+    ordered = list(dict.fromkeys(job_ids))
+    query = select(models.Job).where(models.Job.id.in_(ordered))
+    if customer_id:
+        query = query.where(models.Job.customer_id == customer_id)
+    if technician_id:
+        # Assigned jobs, plus jobs this technician has been offered
+        offered = select(models.JobOffer.job_id).where(models.JobOffer.technician_id == technician_id)
+        query = query.where(or_(models.Job.technician_id == technician_id, models.Job.id.in_(offered)))
+    result = await db.execute(query)
+    found = {job.id: job for job in result.scalars().all()}
+    items = [found[job_id] for job_id in ordered if job_id in found]
+    missing = [job_id for job_id in ordered if job_id not in found]
+    return items, missing
+
+async def list_offers(
+    db: AsyncSession,
+    technician_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    status: JobOfferStatus = JobOfferStatus.PENDING,
+):
+    query = select(models.JobOffer).where(
+        models.JobOffer.technician_id == technician_id,
+        models.JobOffer.status == status,
+    )
+    if status == JobOfferStatus.PENDING:
+        # Past their deadline but not yet swept by the matching worker
+        query = query.where(models.JobOffer.expires_at > datetime.utcnow())
+    return await fetch_page(db, query, models.JobOffer.created_at, models.JobOffer.id, cursor, limit)
+
 async def create_job(db: AsyncSession, user_id: str, job_in: schemas.JobCreate):
     db_job = models.Job(
         customer_id=user_id,
         **job_in.model_dump(),
         status=JobStatus.REQUESTED
     )
-    db.add(db_job)
-    await db.commit()
-    await db.refresh(db_job)
+    await save(db, db_job)
+    matching_queue.push(db_job.id)
     return db_job
 
-async def transition_job_status(db: AsyncSession, job_id: str, new_status: JobStatus):
+# State machine: status -> statuses it may move to
+VALID_TRANSITIONS = {
+    JobStatus.REQUESTED: [JobStatus.MATCHING, JobStatus.CANCELLED],
+    JobStatus.MATCHING: [JobStatus.ASSIGNED, JobStatus.REQUESTED, JobStatus.CANCELLED], # REQUESTED allowed if no match? Or Cancelled.
+    JobStatus.ASSIGNED: [JobStatus.IN_PROGRESS, JobStatus.CANCELLED],
+    JobStatus.IN_PROGRESS: [JobStatus.COMPLETED, JobStatus.CANCELLED], # Can cancel in progress? Maybe with penalty.
+    JobStatus.COMPLETED: [], # Terminal
+    JobStatus.CANCELLED: [], # Terminal
+}
+
+def allowed_sources(new_status: JobStatus) -> list:
+    return [source for source, targets in VALID_TRANSITIONS.items() if new_status in targets]
+
+async def apply_transition(db: AsyncSession, job_id: str, new_status: JobStatus, *conditions, **values):
+    """
+    Move a job to `new_status` in a single conditional
+    UPDATE ... WHERE status IN (allowed sources) AND <conditions> RETURNING.
+    Bumps `version`. Returns the updated Job, or None if the job doesn't
+    exist, isn't in a status that may move to `new_status`, or fails one
+    of `conditions` -- including because a concurrent request got there
+    first. Does not commit.
+    """
+    result = await db.execute(
+        update(models.Job)
+        .where(
+            models.Job.id == job_id,
+            models.Job.status.in_(allowed_sources(new_status)),
+            *conditions,
+        )
+        .values(status=new_status, version=models.Job.version + 1, **values)
+        .returning(models.Job)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalars().first()
+
+async def _transition_failed(db: AsyncSession, job_id: str, detail: str, owner_check=None):
+    """
+    Work out why apply_transition matched nothing (error path only).
+    Anything already written in this transaction is discarded when the
+    request's session closes without a commit.
+    """
     job = await get_job(db, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    # State Machine Logic
-    valid_transitions = {
-        JobStatus.REQUESTED: [JobStatus.MATCHING, JobStatus.CANCELLED],
-        JobStatus.MATCHING: [JobStatus.ASSIGNED, JobStatus.REQUESTED, JobStatus.CANCELLED], # REQUESTED allowed if no match? Or Cancelled.
-        JobStatus.ASSIGNED: [JobStatus.IN_PROGRESS, JobStatus.CANCELLED],
-        JobStatus.IN_PROGRESS: [JobStatus.COMPLETED, JobStatus.CANCELLED], # Can cancel in progress? Maybe with penalty.
-        JobStatus.COMPLETED: [], # Terminal
-        JobStatus.CANCELLED: [], # Terminal
-    }
-    
-    if new_status not in valid_transitions.get(job.status, []):
-         raise HTTPException(
-             status_code=400, 
-             detail=f"Invalid state transition from {job.status} to {new_status}"
-         )
-    
-    job.status = new_status
+    if owner_check is not None and not owner_check(job):
+        raise HTTPException(status_code=403, detail="Not authorized")
+    raise HTTPException(status_code=400, detail=detail.format(status=job.status))
+
+async def transition_job_status(db: AsyncSession, job_id: str, new_status: JobStatus):
+    job = await apply_transition(db, job_id, new_status)
+    if not job:
+        await _transition_failed(db, job_id, f"Invalid state transition from {{status}} to {new_status}")
     await db.commit()
-    await db.refresh(job)
+    publish_status(job)
     return job
 
-async def accept_job_offer(db: AsyncSession, offer_id: str, technician_id: str):
-    stmt = select(models.JobOffer).where(
-        models.JobOffer.id == offer_id,
-        models.JobOffer.technician_id == technician_id, # Ensure ownership
-        models.JobOffer.status == JobOfferStatus.PENDING
+async def _pending_offer_failed(db: AsyncSession, job_id: str, technician_id: str):
+    """Why there was no live pending offer to act on (error path only)."""
+    offer = await db.scalar(select(models.JobOffer).where(
+        models.JobOffer.job_id == job_id,
+        models.JobOffer.technician_id == technician_id,
+        models.JobOffer.status == JobOfferStatus.PENDING,
+    ))
+    if offer is None:
+        raise HTTPException(status_code=400, detail="No active offer found")
+    # Past its deadline but not yet swept
+    offer.status = JobOfferStatus.EXPIRED
+    await db.commit()
+    raise HTTPException(status_code=400, detail="Offer expired")
+
+async def accept_job_offer(db: AsyncSession, job_id: str, technician_id: str):
+    # Claim the offer and the job in the same transaction; if another
+    # technician or a cancel won the job, the rollback releases the offer
+    offer_id = await db.scalar(
+        update(models.JobOffer)
+        .where(
+            models.JobOffer.job_id == job_id,
+            models.JobOffer.technician_id == technician_id, # Ensure ownership
+            models.JobOffer.status == JobOfferStatus.PENDING,
+            models.JobOffer.expires_at > datetime.utcnow(),
+        )
+        .values(status=JobOfferStatus.ACCEPTED)
+        .returning(models.JobOffer.id)
+        .execution_options(synchronize_session=False)
     )
-    result = await db.execute(stmt)
-    offer = result.scalars().first()
-    
-    if not offer:
-        raise HTTPException(status_code=400, detail="Offer not available or expired")
-    
-    # Check expiry explicitly if DB doesn't handle timezones perfectly or lag
-    if offer.expires_at.replace(tzinfo=None) < datetime.utcnow():
-         offer.status = JobOfferStatus.EXPIRED
-         db.add(offer)
-         await db.commit()
-         raise HTTPException(status_code=400, detail="Offer expired")
-
-    # Update Offer
-    offer.status = JobOfferStatus.ACCEPTED
-    
-    # Update Job
-    job = await get_job(db, offer.job_id)
+    if offer_id is None:
+        await _pending_offer_failed(db, job_id, technician_id)
+
+    job = await apply_transition(db, job_id, JobStatus.ASSIGNED, technician_id=technician_id)
     if not job:
-         raise HTTPException(status_code=404, detail="Job not found")
-    
-    # Ensure job is still MATCHING?
-    if job.status != JobStatus.MATCHING:
-         raise HTTPException(status_code=400, detail="Job no longer active")
-
-    job.status = JobStatus.ASSIGNED
-    job.technician_id = technician_id
-    
-    db.add(offer)
-    db.add(job)
+        await _transition_failed(db, job_id, "Job no longer active")
+
+    enqueue_notification(
+        db, job.customer_id, "A technician accepted your job",
+        {"job_id": job.id, "status": job.status.value}, dedupe_key=f"job:{job.id}:accepted",
+    )
     await db.commit()
-    await db.refresh(job)
+    publish_status(job)
     return job
 
+async def reject_job_offer(db: AsyncSession, job_id: str, technician_id: str):
+    offer = await db.scalar(
+        update(models.JobOffer)
+        .where(
+            models.JobOffer.job_id == job_id,
+            models.JobOffer.technician_id == technician_id, # Ensure ownership
+            models.JobOffer.status == JobOfferStatus.PENDING,
+        )
+        .values(status=JobOfferStatus.REJECTED)
+        .returning(models.JobOffer)
+        .execution_options(synchronize_session=False)
+    )
+    if offer is None:
+        raise HTTPException(status_code=400, detail="No active offer found")
+    await db.commit()
+    # Offer the job to the next technician right away
+    matching_queue.push(job_id)
+    return offer
+
 async def start_job(db: AsyncSession, job_id: str, technician_id: str):
-    job = await get_job(db, job_id)
+    job = await apply_transition(db, job_id, JobStatus.IN_PROGRESS, models.Job.technician_id == technician_id)
     if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    if job.technician_id != technician_id:
-        raise HTTPException(status_code=403, detail="Not assigned to this job")
-        
-    if job.status != JobStatus.ASSIGNED:
-        raise HTTPException(status_code=400, detail="Job must be ASSIGNED to start")
-        
-    job.status = JobStatus.IN_PROGRESS
+        await _transition_failed(
+            db, job_id, "Job must be ASSIGNED to start",
+            owner_check=lambda j: j.technician_id == technician_id,
+        )
     await db.commit()
-    await db.refresh(job)
+    publish_status(job)
     return job
 
 async def complete_job(db: AsyncSession, job_id: str, technician_id: str):
-    job = await get_job(db, job_id)
+    job = await apply_transition(db, job_id, JobStatus.COMPLETED, models.Job.technician_id == technician_id)
     if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-        
-    if job.technician_id != technician_id:
-        raise HTTPException(status_code=403, detail="Not assigned to this job")
-        
-    if job.status != JobStatus.IN_PROGRESS:
-        raise HTTPException(status_code=400, detail="Job must be IN_PROGRESS to complete")
-        
-    job.status = JobStatus.COMPLETED
+        await _transition_failed(
+            db, job_id, "Job must be IN_PROGRESS to complete",
+            owner_check=lambda j: j.technician_id == technician_id,
+        )
+
     # Trigger payment calculation
     from modules.payments import service as payment_service
     await payment_service.create_payment_for_job(db, job)
-    
+    enqueue_notification(
+        db, job.customer_id, "Your job has been completed",
+        {"job_id": job.id, "status": job.status.value}, dedupe_key=f"job:{job.id}:completed",
+    )
+
     await db.commit()
-    await db.refresh(job)
+    publish_status(job)
+    # Technician is free again; wake jobs waiting for capacity
+    matching_queue.push(job.id)
     return job
 
 async def cancel_job(db: AsyncSession, job_id: str, user_id: str, role: str):
-    job = await get_job(db, job_id)
+    # Auth checks: customers cancel their own jobs, technicians the ones
+    # assigned to them
+    conditions = []
+    if role == "CUSTOMER":
+        conditions.append(models.Job.customer_id == user_id)
+    if role == "TECHNICIAN":
+        conditions.append(models.Job.technician_id == user_id)
+
+    job = await apply_transition(db, job_id, JobStatus.CANCELLED, *conditions)
     if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    
-    # Auth checks
-    if role == "CUSTOMER" and job.customer_id != user_id:
-         raise HTTPException(status_code=403, detail="Not authorized")
-    if role == "TECHNICIAN" and job.technician_id != user_id: # and not None?
-         # If not assigned, technician cannot cancel? 
-         # Step 9 says "Cancellation rules enforced".
-         # Usually only assigned tech or customer can cancel.
-         raise HTTPException(status_code=403, detail="Not authorized")
-         
-    if job.status in [JobStatus.COMPLETED, JobStatus.CANCELLED]:
-        raise HTTPException(status_code=400, detail="Job already finished")
-        
-    job.status = JobStatus.CANCELLED
+        def owner_check(j):
+            if role == "CUSTOMER":
+                return j.customer_id == user_id
+            if role == "TECHNICIAN":
+                return j.technician_id == user_id
+            return True
+        await _transition_failed(db, job_id, "Job already finished", owner_check=owner_check)
+
     await db.commit()
-    await db.refresh(job)
+    publish_status(job)
+    # Releases any technician holding an offer or the assignment
+    matching_queue.push(job.id)
     return job
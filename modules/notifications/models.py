@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, Boolean, DateTime, Text, JSON
+from sqlalchemy import Column, String, ForeignKey, Boolean, DateTime, Text, JSON, Integer, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import Base
@@ -17,3 +17,34 @@ class Notification(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     user = relationship("modules.auth.models.User", backref="notifications")
+
+    __table_args__ = (
+        # Feed pages: WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index("ix_notifications_user_created", "user_id", "created_at", "id"),
+    )
+
+class NotificationCounter(Base):
+    """
+    Per-user unread count, kept in step with inserts and mark-read so the
+    badge is a primary-key lookup instead of a COUNT(*).
+    """
+    __tablename__ = "notification_counters"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    unread = Column(Integer, default=0, nullable=False)
+
+class NotificationOutbox(Base):
+    """
+    Notifications waiting for delivery. Services add rows inside their own
+    transaction; workers.notifications turns them into Notification rows
+    in bulk.
+    """
+    __tablename__ = "notification_outbox"
+
+    id = Column(String, primary_key=True, default=generate_uuid, index=True)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    message = Column(Text, nullable=False)
+    payload = Column(JSON, nullable=True)
+    dedupe_key = Column(String, nullable=True) # Same user + key inside one batch -> one notification
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -1,36 +1,47 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
-from core.database import get_db
-from modules.notifications import models, schemas
+from typing import Optional
+from core.database import get_db, get_read_db
+from core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from modules.notifications import models, schemas, service
 from modules.auth.models import User
 from modules.auth.dependencies import get_current_user
+from shared.schemas import CursorPage
+from core.serialization import Serializer
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
-async def create_notification(db: AsyncSession, user_id: str, message: str, payload: dict = None):
-    # This function is internal, called by other services
-    notification = models.Notification(
-        user_id=user_id,
-        message=message,
-        payload=payload
-    )
-    db.add(notification)
-    # Commit handled by caller usually or here?
-    # Better here if async task.
-    await db.commit()
-    await db.refresh(notification)
-    return notification
+page_serializer = Serializer(CursorPage[schemas.NotificationResponse])
 
-@router.get("/", response_model=List[schemas.NotificationResponse])
+@router.get("/", response_model=CursorPage[schemas.NotificationResponse])
 async def list_messages(
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    is_read: Optional[bool] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    items, next_cursor = await service.list_notifications(db, current_user.id, cursor, limit, is_read)
+    return page_serializer.response({"items": items, "next_cursor": next_cursor})
+
+@router.get("/unread-count", response_model=schemas.UnreadCountResponse)
+async def unread_count(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return {"unread": await service.get_unread_count(db, current_user.id)}
+
+@router.post("/{notification_id}/read", response_model=schemas.UnreadCountResponse)
+async def mark_read(
+    notification_id: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    return {"unread": await service.mark_read(db, current_user.id, notification_id)}
+
+@router.post("/read-all", response_model=schemas.UnreadCountResponse)
+async def mark_all_read(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    result = await db.execute(
-        select(models.Notification)
-        .where(models.Notification.user_id == current_user.id)
-        .order_by(models.Notification.created_at.desc())
-    )
-    return result.scalars().all()
+    return {"unread": await service.mark_all_read(db, current_user.id)}
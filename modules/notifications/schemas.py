@@ -11,3 +11,6 @@ class NotificationResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+class UnreadCountResponse(BaseModel):
+    unread: int
@@ -0,0 +1,126 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.dialects import postgresql, sqlite
+from typing import Dict, Optional
+from core.pagination import fetch_page
+from core.database import save
+from modules.notifications import models
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE; others use UPDATE-then-INSERT
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+def _upsert_insert(db: AsyncSession):
+    return _UPSERT_INSERTS.get(db.get_bind().dialect.name)
+
+async def adjust_unread(db: AsyncSession, user_id: str, delta: int):
+    # Upsert so the counter row is created on a user's first notification
+    counter = models.NotificationCounter.__table__
+    insert = _upsert_insert(db)
+    if insert is None:
+        result = await db.execute(
+            update(counter).where(counter.c.user_id == user_id).values(unread=counter.c.unread + delta)
+        )
+        if result.rowcount == 0:
+            await db.execute(counter.insert().values(user_id=user_id, unread=max(delta, 0)))
+        return
+    stmt = insert(counter).values(user_id=user_id, unread=max(delta, 0))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[counter.c.user_id],
+        set_={"unread": counter.c.unread + delta},
+    )
+    await db.execute(stmt)
+
+async def adjust_unread_many(db: AsyncSession, deltas: Dict[str, int]):
+    """Bulk version of adjust_unread: one executemany for all users."""
+    if not deltas:
+        return
+    counter = models.NotificationCounter.__table__
+    insert = _upsert_insert(db)
+    if insert is None:
+        for user_id, delta in deltas.items():
+            await adjust_unread(db, user_id, delta)
+        return
+    stmt = insert(counter).values(user_id=bindparam("uid"), unread=bindparam("delta"))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[counter.c.user_id],
+        set_={"unread": counter.c.unread + stmt.excluded.unread},
+    )
+    await db.execute(stmt, [{"uid": user_id, "delta": delta} for user_id, delta in deltas.items()])
+
+def enqueue_notification(
+    db: AsyncSession,
+    user_id: str,
+    message: str,
+    payload: dict = None,
+    dedupe_key: str = None,
+):
+    """
+    Queue a notification as part of the caller's transaction. Nothing is
+    flushed or committed here; the row is delivered by the notification
+    worker once the caller commits.
+    """
+    db.add(models.NotificationOutbox(
+        user_id=user_id,
+        message=message,
+        payload=payload,
+        dedupe_key=dedupe_key,
+    ))
+    db.info["notification_outbox"] = db.info.get("notification_outbox", 0) + 1
+
+async def create_notification(db: AsyncSession, user_id: str, message: str, payload: dict = None):
+    # This function is internal, called by other services
+    notification = models.Notification(
+        user_id=user_id,
+        message=message,
+        payload=payload
+    )
+    db.add(notification)
+    await adjust_unread(db, user_id, 1)
+    return await save(db, notification)
+
+async def list_notifications(
+    db: AsyncSession,
+    user_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 20,
+    is_read: Optional[bool] = None,
+):
+    query = select(models.Notification).where(models.Notification.user_id == user_id)
+    if is_read is not None:
+        query = query.where(models.Notification.is_read == is_read)
+    return await fetch_page(db, query, models.Notification.created_at, models.Notification.id, cursor, limit)
+
+async def get_unread_count(db: AsyncSession, user_id: str) -> int:
+    unread = await db.scalar(
+        select(models.NotificationCounter.unread).where(models.NotificationCounter.user_id == user_id)
+    )
+    return max(unread or 0, 0)
+
+async def mark_read(db: AsyncSession, user_id: str, notification_id: str) -> int:
+    result = await db.execute(
+        update(models.Notification)
+        .where(
+            models.Notification.id == notification_id,
+            models.Notification.user_id == user_id,
+            models.Notification.is_read == False,
+        )
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        await adjust_unread(db, user_id, -result.rowcount)
+    await db.commit()
+    return await get_unread_count(db, user_id)
+
+async def mark_all_read(db: AsyncSession, user_id: str) -> int:
+    result = await db.execute(
+        update(models.Notification)
+        .where(models.Notification.user_id == user_id, models.Notification.is_read == False)
+        .values(is_read=True)
+        .execution_options(synchronize_session=False)
+    )
+    # Decrement rather than zero, so a delivery committed in between still counts
+    if result.rowcount:
+        await adjust_unread(db, user_id, -result.rowcount)
+    await db.commit()
+    return await get_unread_count(db, user_id)
@@ -11,7 +11,7 @@ async def create_payment_for_job(db: AsyncSession, job: job_models.Job):
     # Job model has relation to Service.
     
     price = job.estimated_price if job.estimated_price else 0.0
-    if price == 0 and job.service:
+    if price == 0 and job.service_id:
          # Need to fetch service price? Job object might have it loaded.
          # For safety, use 0 or ensure price is set.
          pass
@@ -0,0 +1,52 @@
+import asyncio
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.database import get_db
+from core.realtime import hub, user_topic, technician_topic
+from modules.auth.dependencies import authenticate_token, load_technician
+from shared.enums import UserRole
+
+router = APIRouter(prefix="/realtime", tags=["Realtime"])
+
+@router.websocket("/ws")
+async def realtime_socket(
+    websocket: WebSocket,
+    token: str = Query(...),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Push channel for job offers and job status changes. Browsers cannot
+    set headers on a WebSocket, so the access token goes in `?token=`.
+    """
+    try:
+        user = await authenticate_token(db, token)
+        topics = [user_topic(user.id)]
+        if user.role == UserRole.TECHNICIAN:
+            technician = await load_technician(db, user)
+            if technician is not None:
+                topics.append(technician_topic(technician.id))
+    except Exception:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    # Don't hold a DB connection for the lifetime of the socket
+    await db.close()
+
+    await websocket.accept()
+    subscription = hub.subscribe(topics)
+
+    async def pump():
+        while True:
+            message = await subscription.get()
+            await websocket.send_json({k: v for k, v in message.items() if not k.startswith("_")})
+            hub.delivered(message)
+
+    sender = asyncio.create_task(pump())
+    try:
+        # Clients only send pings; reading is how we notice a disconnect
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        hub.unsubscribe(subscription)
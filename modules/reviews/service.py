@@ -5,6 +5,8 @@ from modules.jobs import models as job_models
 from modules.users import models as user_models
 from shared.enums import JobStatus
 from fastapi import HTTPException
+from workers.technician_index import technician_index
+from core.database import save
 
 async def create_review(db: AsyncSession, user_id: str, review_in: schemas.ReviewCreate):
     # Check if job exists
@@ -47,6 +49,7 @@ async def create_review(db: AsyncSession, user_id: str, review_in: schemas.Revie
         tech.total_reviews = new_total
         db.add(tech)
 
-    await db.commit()
-    await db.refresh(review)
+    await save(db, review)
+    if tech and tech.is_verified:
+        technician_index.upsert(tech.id, tech.average_rating, tech.latitude, tech.longitude)
     return review
@@ -1,18 +1,38 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from core.database import get_db
+from core.database import get_db, get_read_db
 from modules.services import models, schemas, service
 from modules.auth.models import User
 from core.rbac import require_role
 from shared.enums import UserRole
 from core.log import logger
+from core.config import settings
+from modules.admin.service import log_admin_action
 
 router = APIRouter(prefix="/services", tags=["Services"])
 
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags
+
 @router.get("/", response_model=List[schemas.ServiceResponse])
-async def list_services(db: AsyncSession = Depends(get_db)):
-    return await service.get_services(db, active_only=True)
+async def list_services(request: Request, db: AsyncSession = Depends(get_read_db)):
+    headers = {"Cache-Control": f"public, max-age={settings.SERVICE_CATALOGUE_MAX_AGE}"}
+    if_none_match = request.headers.get("if-none-match")
+
+    # Revalidation against a warm cache never touches the DB
+    etag = service.cached_catalogue_etag()
+    if if_none_match and etag and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+
+    body, etag = await service.get_catalogue(db)
+    headers["ETag"] = etag
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.post("/", response_model=schemas.ServiceResponse)
 async def create_service_endpoint(
@@ -21,6 +41,7 @@ async def create_service_endpoint(
     current_user: User = Depends(require_role(UserRole.ADMIN))
 ):
     srv = await service.create_service(db, service_in)
+    log_admin_action(current_user.id, "CREATE_SERVICE", f"service={srv.id} name={srv.name}")
     logger.track(f"Service created: {srv.name} [{srv.id}] by ADMIN {current_user.email}")
     return srv
 
@@ -32,6 +53,7 @@ async def update_service_endpoint(
     current_user: User = Depends(require_role(UserRole.ADMIN))
 ):
     srv = await service.update_service(db, service_id, service_in)
+    log_admin_action(current_user.id, "UPDATE_SERVICE", f"service={srv.id} fields={','.join(service_in.model_dump(exclude_unset=True))}")
     logger.info(f"Service updated: {srv.name} [{srv.id}]")
     return srv
 
@@ -42,5 +64,6 @@ async def delete_service_endpoint(
     current_user: User = Depends(require_role(UserRole.ADMIN))
 ):
     srv = await service.delete_service(db, service_id)
+    log_admin_action(current_user.id, "DELETE_SERVICE", f"service={srv.id} name={srv.name}")
     logger.warn(f"Service deleted (soft): {srv.name} [{srv.id}] by ADMIN {current_user.email}")
     return srv
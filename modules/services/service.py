@@ -1,7 +1,52 @@
+import time
+import hashlib
+from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from modules.services import models, schemas
 from fastapi import HTTPException
+from core.config import settings
+from core.metrics import register_stats
+from core.serialization import Serializer
+from core.database import save
+
+# Public catalogue, kept as ready-to-send JSON. Admin edits bump `version`;
+# the TTL bounds staleness when several processes each hold a copy.
+_catalogue = {"version": 0, "built_version": -1, "built_at": 0.0, "body": None, "etag": None}
+_catalogue_counters = {"hits": 0, "rebuilds": 0}
+_catalogue_serializer = Serializer(List[schemas.ServiceResponse])
+
+def invalidate_catalogue():
+    _catalogue["version"] += 1
+
+def _catalogue_fresh() -> bool:
+    return (
+        _catalogue["body"] is not None
+        and _catalogue["built_version"] == _catalogue["version"]
+        and time.monotonic() - _catalogue["built_at"] < settings.SERVICE_CATALOGUE_TTL_SECONDS
+    )
+
+def cached_catalogue_etag():
+    """ETag of the cached catalogue if it is still current, else None."""
+    return _catalogue["etag"] if _catalogue_fresh() else None
+
+async def get_catalogue(db: AsyncSession):
+    """Active services as (json_bytes, etag), served from memory when current."""
+    if _catalogue_fresh():
+        _catalogue_counters["hits"] += 1
+        return _catalogue["body"], _catalogue["etag"]
+
+    version = _catalogue["version"]
+    services = await get_services(db, active_only=True)
+    body = _catalogue_serializer.dumps(services)
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+    _catalogue_counters["rebuilds"] += 1
+    # An edit that landed while we were querying wins; don't cache stale data
+    if _catalogue["version"] == version:
+        _catalogue.update(built_version=version, built_at=time.monotonic(), body=body, etag=etag)
+    return body, etag
+
+register_stats("service_catalogue", lambda: {**_catalogue_counters, "version": _catalogue["version"]})
 
 async def get_services(db: AsyncSession, active_only: bool = True):
     query = select(models.Service)
@@ -16,9 +61,8 @@ async def get_service(db: AsyncSession, service_id: str):
 
 async def create_service(db: AsyncSession, service_in: schemas.ServiceCreate):
     db_service = models.Service(**service_in.model_dump())
-    db.add(db_service)
-    await db.commit()
-    await db.refresh(db_service)
+    await save(db, db_service)
+    invalidate_catalogue()
     return db_service
 
 async def update_service(db: AsyncSession, service_id: str, service_in: schemas.ServiceUpdate):
@@ -30,8 +74,8 @@ async def update_service(db: AsyncSession, service_id: str, service_in: schemas.
     for key, value in update_data.items():
         setattr(db_service, key, value)
     
-    await db.commit()
-    await db.refresh(db_service)
+    await save(db, db_service)
+    invalidate_catalogue()
     return db_service
 
 async def delete_service(db: AsyncSession, service_id: str):
@@ -40,6 +84,6 @@ async def delete_service(db: AsyncSession, service_id: str):
         raise HTTPException(status_code=404, detail="Service not found")
     
     db_service.is_active = False # Soft delete
-    await db.commit()
-    await db.refresh(db_service)
+    await save(db, db_service)
+    invalidate_catalogue()
     return db_service
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, Boolean, ForeignKey, Integer, Float
+from sqlalchemy import Column, String, Boolean, ForeignKey, Integer, Float, Index, DateTime
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from core.database import Base
 from modules.auth.models import generate_uuid
@@ -12,15 +13,26 @@ class Technician(Base):
     bio = Column(String, nullable=True)
     phone = Column(String, nullable=True)
     address = Column(String, nullable=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
     is_verified = Column(Boolean, default=False)
     
     # Rating/Reputation from Step 11
     average_rating = Column(Float, default=0.0)
     total_reviews = Column(Integer, default=0)
+    # Watermark for the technician index's delta refresh
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
 
     user = relationship("modules.auth.models.User", backref="technician_profile")
     documents = relationship("TechnicianDocument", back_populates="technician")
 
+    __table_args__ = (
+        # Verified technicians by rating (technician index reload)
+        Index("ix_technicians_verified_rating", "is_verified", "average_rating"),
+        # Technician index refresh: WHERE updated_at >= watermark
+        Index("ix_technicians_updated", "updated_at"),
+    )
+
 class TechnicianDocument(Base):
     __tablename__ = "technician_documents"
 
@@ -1,12 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
 from sqlalchemy.ext.asyncio import AsyncSession
-from core.database import get_db
+from core.database import get_db, save
 from modules.users import models, schemas, service
 from modules.auth.models import User
 from core.rbac import require_role
 from shared.enums import UserRole
-from modules.auth.dependencies import get_current_user
+from modules.auth.dependencies import get_current_user, invalidate_principal
 from core.log import logger
+from modules.admin.service import log_admin_action
 import shutil
 import os
 
@@ -19,6 +20,8 @@ async def apply_as_technician(
     current_user: User = Depends(require_role(UserRole.TECHNICIAN))
 ):
     tech = await service.create_technician_profile(db, current_user.id, tech_in)
+    # Cached principal still says "no profile"
+    invalidate_principal(current_user.email)
     logger.track(f"Technician profile created: {current_user.email}")
     return tech
 
@@ -27,7 +30,7 @@ async def get_my_profile(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_role(UserRole.TECHNICIAN))
 ):
-    tech = await service.get_technician_by_user_id(db, current_user.id)
+    tech = await service.get_technician_by_user_id(db, current_user.id, with_documents=True)
     if not tech:
         raise HTTPException(status_code=404, detail="Profile not found")
     return tech
@@ -39,6 +42,7 @@ async def approve_technician(
     current_user: User = Depends(require_role(UserRole.ADMIN))
 ):
     tech = await service.verify_technician(db, technician_id)
+    log_admin_action(current_user.id, "APPROVE_TECHNICIAN", f"technician={technician_id}")
     logger.track(f"Technician {technician_id} approved by ADMIN {current_user.email}")
     return tech
 
@@ -68,7 +72,4 @@ async def upload_document(
         file_url=file_location,
         document_type=document_type
     )
-    db.add(doc)
-    await db.commit()
-    await db.refresh(doc)
-    return doc
+    return await save(db, doc)
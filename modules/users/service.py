@@ -1,10 +1,17 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from core.database import save
 from modules.users import models, schemas
 from fastapi import HTTPException, status
+from workers.technician_index import technician_index
 
-async def get_technician_by_user_id(db: AsyncSession, user_id: str):
-    result = await db.execute(select(models.Technician).where(models.Technician.user_id == user_id))
+async def get_technician_by_user_id(db: AsyncSession, user_id: str, with_documents: bool = False):
+    query = select(models.Technician).where(models.Technician.user_id == user_id)
+    if with_documents:
+        # TechnicianResponse includes documents; lazy loading isn't possible under asyncio
+        query = query.options(selectinload(models.Technician.documents))
+    result = await db.execute(query)
     return result.scalars().first()
 
 async def create_technician_profile(db: AsyncSession, user_id: str, tech_in: schemas.TechnicianCreate):
@@ -15,19 +22,21 @@ async def create_technician_profile(db: AsyncSession, user_id: str, tech_in: sch
     
     db_tech = models.Technician(
         user_id=user_id,
+        documents=[], # New profile; nothing to load
         **tech_in.model_dump()
     )
-    db.add(db_tech)
-    await db.commit()
-    await db.refresh(db_tech)
-    return db_tech
+    return await save(db, db_tech)
 
 async def verify_technician(db: AsyncSession, technician_id: str):
-    result = await db.execute(select(models.Technician).where(models.Technician.id == technician_id))
+    result = await db.execute(
+        select(models.Technician)
+        .where(models.Technician.id == technician_id)
+        .options(selectinload(models.Technician.documents))
+    )
     tech = result.scalars().first()
     if not tech:
         raise HTTPException(status_code=404, detail="Technician not found")
     tech.is_verified = True
-    await db.commit()
-    await db.refresh(tech)
+    await save(db, tech)
+    technician_index.upsert(tech.id, tech.average_rating, tech.latitude, tech.longitude)
     return tech
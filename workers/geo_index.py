@@ -0,0 +1,123 @@
+import heapq
+import math
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+class GeoIndex:
+    """
+    Fixed-size lat/lng grid (geohash-style bucketing) for k-nearest
+    lookups. Points are bucketed by cell; a query scans rings of cells
+    outward from the query cell and stops once no unvisited ring can hold
+    anything closer than the k-th best hit so far.
+    """
+    def __init__(self, cell_degrees: float = 0.02):
+        self.cell_degrees = cell_degrees
+        self._cells: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        self._points: Dict[str, Tuple[float, float]] = {}
+
+    def __len__(self):
+        return len(self._points)
+
+    def __contains__(self, key: str):
+        return key in self._points
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees))
+
+    def get(self, key: str) -> Optional[Tuple[float, float]]:
+        return self._points.get(key)
+
+    def clear(self):
+        self._cells.clear()
+        self._points.clear()
+
+    def upsert(self, key: str, lat: float, lng: float):
+        self.remove(key)
+        self._points[key] = (lat, lng)
+        self._cells[self._cell(lat, lng)].add(key)
+
+    def remove(self, key: str):
+        point = self._points.pop(key, None)
+        if point is None:
+            return
+        cell = self._cell(*point)
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(key)
+            if not bucket:
+                del self._cells[cell]
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 1,
+        max_km: Optional[float] = None,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[float, str]]:
+        """
+        Up to `k` (distance_km, key) pairs closest to (lat, lng), nearest
+        first. `accept` filters keys (exclusions, capacity) during the
+        scan so rejected points never take up one of the k slots.
+        """
+        if not self._points or k <= 0:
+            return []
+
+        cx, cy = self._cell(lat, lng)
+        # Smallest side of a cell near the query; lng cells shrink with latitude
+        cell_km = self.cell_degrees * KM_PER_DEGREE * max(math.cos(math.radians(min(abs(lat) + self.cell_degrees, 89.0))), 0.01)
+        max_ring = None
+        if max_km is not None:
+            max_ring = int(max_km / cell_km) + 1
+
+        # Max-heap of the best k as (-distance, key)
+        best: List[Tuple[float, str]] = []
+        seen = 0
+        ring = 0
+        while True:
+            if max_ring is not None and ring > max_ring:
+                break
+            if len(best) == k and (ring - 1) * cell_km > -best[0][0]:
+                break
+            if seen >= len(self._points):
+                break
+
+            for cell in self._ring_cells(cx, cy, ring):
+                bucket = self._cells.get(cell)
+                if not bucket:
+                    continue
+                seen += len(bucket)
+                for key in bucket:
+                    if accept is not None and not accept(key):
+                        continue
+                    plat, plng = self._points[key]
+                    distance = haversine_km(lat, lng, plat, plng)
+                    if max_km is not None and distance > max_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, key))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, key))
+            ring += 1
+
+        return sorted((-d, key) for d, key in best)
+
+    @staticmethod
+    def _ring_cells(cx: int, cy: int, ring: int):
+        if ring == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
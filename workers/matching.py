@@ -1,100 +1,260 @@
 import asyncio
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, func
+from sqlalchemy import select, update, insert, func, union_all
+from core.config import settings
 from core.database import SessionLocal
+from core.log import logger
+from core.instrumentation import measure
+from core.realtime import hub, user_topic, technician_topic
 from modules.jobs import models as job_models
 from modules.users import models as user_models
+from modules.notifications import service as notification_service
 from shared.enums import JobStatus, JobOfferStatus
+from workers.queue import matching_queue
+from workers.technician_index import technician_index
 from datetime import datetime, timedelta
 
+# Jobs that found no technician with spare capacity on their last pass.
+# They ride along with the next event-driven batch, since most events
+# (rejections, expiries, completions) free up a technician.
+_starved: Set[str] = set()
+
 async def run_matching_worker():
+    """
+    Consume job ids pushed by the job service and offer expiry timers as
+    soon as they arrive. A full sweep still runs every
+    MATCHING_RECONCILE_INTERVAL_SECONDS to catch anything missed (restarts,
+    jobs created by another process, timers lost on shutdown).
+    """
+    loop = asyncio.get_running_loop()
+    interval = settings.MATCHING_RECONCILE_INTERVAL_SECONDS
+    next_sweep = loop.time()
     while True:
+        job_ids = await matching_queue.get_batch(timeout=max(0.0, next_sweep - loop.time()))
+        # Sweep on schedule even when events keep arriving; a full sweep
+        # covers the batch's jobs too
+        sweep = loop.time() >= next_sweep
         try:
-            async with SessionLocal() as db:
-                await process_matching(db)
+            with measure("matching"):
+                async with SessionLocal() as db:
+                    if sweep:
+                        # Pick up technician changes made by other processes
+                        await technician_index.refresh(db)
+                        await process_matching(db)
+                    elif job_ids:
+                        await process_matching(db, list(_starved.union(job_ids)))
         except Exception as e:
-            print(f"Matching worker error: {e}")
-        await asyncio.sleep(10) # Run every 10 seconds
+            logger.error.medium(f"Matching worker error: {e}")
+        if sweep:
+            next_sweep = loop.time() + interval
 
-async def process_matching(db: AsyncSession):
-    # 1. Move REQUESTED to MATCHING
-    stmt = select(job_models.Job).where(job_models.Job.status == JobStatus.REQUESTED)
-    result = await db.execute(stmt)
-    requested_jobs = result.scalars().all()
-    
-    for job in requested_jobs:
-        job.status = JobStatus.MATCHING
-        db.add(job)
-    await db.commit()
+def assign_offers(
+    job_ids: List[str],
+    excluded: Dict[str, Set[str]],
+    load: Dict[str, int],
+    capacity: int,
+    locations: Optional[Dict[str, Tuple[float, float]]] = None,
+) -> Dict[str, str]:
+    """
+    Greedy capacity-aware assignment for one sweep.
 
-    # 2. Process MATCHING jobs
-    stmt = select(job_models.Job).where(job_models.Job.status == JobStatus.MATCHING)
-    result = await db.execute(stmt)
-    matching_jobs = result.scalars().all()
-
-    for job in matching_jobs:
-        # Check active offer
-        stmt = select(job_models.JobOffer).where(
-            job_models.JobOffer.job_id == job.id,
-            job_models.JobOffer.status == JobOfferStatus.PENDING,
-            job_models.JobOffer.expires_at > func.now()
-        )
-        result = await db.execute(stmt)
-        active_offer = result.scalars().first()
-        
-        if active_offer:
+    Jobs are served in the order given (oldest first); each gets the best
+    technician it has not been offered before and who still has spare
+    capacity. For jobs in `locations` that is the nearest one within
+    MATCHING_MAX_DISTANCE_KM, falling back to rating order when nobody
+    nearby is free; other jobs go by rating alone. `load` is updated in
+    place, so a top technician takes at most `capacity` jobs per sweep and
+    the rest spill over to the next best, instead of one technician being
+    offered every open job.
+    """
+    locations = locations or {}
+    assignments = {}
+    free = sum(1 for technician_id in technician_index.candidates() if load.get(technician_id, 0) < capacity)
+    for job_id in job_ids:
+        if free == 0:
+            break
+        skip = excluded.get(job_id, set())
+
+        def available(technician_id: str) -> bool:
+            return technician_id not in skip and load.get(technician_id, 0) < capacity
+
+        chosen = None
+        if job_id in locations:
+            nearest = technician_index.nearest(
+                *locations[job_id], k=1, max_km=settings.MATCHING_MAX_DISTANCE_KM, accept=available
+            )
+            if nearest:
+                chosen = nearest[0][1]
+        if chosen is None:
+            chosen = next((t for t in technician_index.candidates(skip) if available(t)), None)
+        if chosen is None:
             continue
-        
-        # Check if any expired offer exists and mark them?
-        # Database query above already filters expires_at > now. 
-        # But we should update status of expired ones to EXPIRED for record keeping?
-        stmt = select(job_models.JobOffer).where(
-            job_models.JobOffer.job_id == job.id,
-            job_models.JobOffer.status == JobOfferStatus.PENDING,
-            job_models.JobOffer.expires_at <= func.now()
+
+        assignments[job_id] = chosen
+        load[chosen] = load.get(chosen, 0) + 1
+        if load[chosen] >= capacity:
+            free -= 1
+    return assignments
+
+def _publish_events(promoted, expired, new_offers):
+    """Push the committed outcome of a pass to connected clients."""
+    for job_id, customer_id, version in promoted:
+        hub.publish(user_topic(customer_id), {"type": "job.status_changed", "job_id": job_id, "status": JobStatus.MATCHING.value, "version": version})
+    for job_id, technician_id in expired:
+        hub.publish(technician_topic(technician_id), {"type": "offer.expired", "job_id": job_id})
+    for offer in new_offers:
+        hub.publish(technician_topic(offer["technician_id"]), {
+            "type": "offer.created",
+            "job_id": offer["job_id"],
+            "expires_at": offer["expires_at"].isoformat(),
+        })
+
+async def process_matching(db: AsyncSession, job_ids: Optional[List[str]] = None):
+    """
+    Run one set-based matching pass. With `job_ids` only those jobs are
+    considered, otherwise every REQUESTED and MATCHING job is swept.
+
+    The number of statements is constant regardless of how many jobs are
+    open: two UPDATE ... RETURNINGs, three SELECTs, one bulk INSERT and a single commit,
+    plus one SELECT and one outbox INSERT when offers are made.
+    Technician candidates come from `technician_index` rather than a query,
+    nearest first for jobs with coordinates, and offers are spread by
+    `assign_offers` so nobody holds more than MATCHING_TECHNICIAN_CAPACITY
+    offers and active jobs at once.
+    """
+    Job = job_models.Job
+    JobOffer = job_models.JobOffer
+    now = datetime.utcnow()
+
+    def scoped(stmt):
+        if job_ids is not None:
+            stmt = stmt.where(Job.id.in_(job_ids))
+        return stmt
+
+    # 1. Move REQUESTED to MATCHING
+    result = await db.execute(
+        scoped(update(Job).where(Job.status == JobStatus.REQUESTED))
+        .values(status=JobStatus.MATCHING, version=Job.version + 1)
+        .returning(Job.id, Job.customer_id, Job.version)
+        .execution_options(synchronize_session=False)
+    )
+    promoted = result.all()
+
+    matching_ids = scoped(select(Job.id).where(Job.status == JobStatus.MATCHING))
+
+    # 2. Expire stale offers in bulk
+    result = await db.execute(
+        update(JobOffer)
+        .where(
+            JobOffer.status == JobOfferStatus.PENDING,
+            JobOffer.expires_at <= now,
+            JobOffer.job_id.in_(matching_ids),
         )
-        result = await db.execute(stmt)
-        expired_offers = result.scalars().all()
-        for offer in expired_offers:
-            offer.status = JobOfferStatus.EXPIRED
-            db.add(offer)
+        .values(status=JobOfferStatus.EXPIRED)
+        .returning(JobOffer.job_id, JobOffer.technician_id)
+        .execution_options(synchronize_session=False)
+    )
+    expired = result.all()
+
+    # 3. Load open jobs and every offer made for them
+    result = await db.execute(
+        scoped(select(Job.id, Job.latitude, Job.longitude).where(Job.status == JobStatus.MATCHING))
+        .order_by(Job.created_at)
+    )
+    rows = result.all()
+    open_jobs = [job_id for job_id, _, _ in rows]
+    locations = {
+        job_id: (latitude, longitude)
+        for job_id, latitude, longitude in rows
+        if latitude is not None and longitude is not None
+    }
+    if job_ids is None:
+        _starved.clear()
+    else:
+        _starved.difference_update(job_ids)
+    if not open_jobs:
         await db.commit()
+        _publish_events(promoted, expired, [])
+        return
 
-        # Find next technician
+    result = await db.execute(
+        select(JobOffer.job_id, JobOffer.technician_id, JobOffer.status)
+        .where(JobOffer.job_id.in_(matching_ids))
+    )
+    has_active_offer = set()
+    excluded = defaultdict(set)
+    for job_id, technician_id, offer_status in result.all():
         # Exclude those who rejected or expired
-        stmt = select(job_models.JobOffer.technician_id).where(
-            job_models.JobOffer.job_id == job.id
-        )
-        result = await db.execute(stmt)
-        excluded_tech_ids = result.scalars().all()
-        
-        # Simple Logic: verified techs not in excluded, order by rating?
-        query = select(user_models.Technician).where(
-            user_models.Technician.is_verified == True
+        excluded[job_id].add(technician_id)
+        if offer_status == JobOfferStatus.PENDING:
+            has_active_offer.add(job_id)
+
+    # 4. Current load per technician: live offers plus jobs in hand
+    outstanding = (
+        select(JobOffer.technician_id.label("technician_id"))
+        .join(Job, Job.id == JobOffer.job_id)
+        .where(JobOffer.status == JobOfferStatus.PENDING, Job.status == JobStatus.MATCHING)
+    )
+    active = (
+        select(Job.technician_id.label("technician_id"))
+        .where(Job.status.in_([JobStatus.ASSIGNED, JobStatus.IN_PROGRESS]))
+    )
+    busy = union_all(outstanding, active).subquery()
+    result = await db.execute(
+        select(busy.c.technician_id, func.count()).group_by(busy.c.technician_id)
+    )
+    load = dict(result.all())
+
+    # 5. Candidates come from the resident index, nearest or best rated first
+    await technician_index.ensure_loaded(db)
+
+    waiting = [job_id for job_id in open_jobs if job_id not in has_active_offer]
+    assignments = assign_offers(waiting, excluded, load, settings.MATCHING_TECHNICIAN_CAPACITY, locations)
+
+    _starved.update(job_id for job_id in waiting if job_id not in assignments)
+
+    tech_users = {}
+    if assignments:
+        result = await db.execute(
+            select(user_models.Technician.id, user_models.Technician.user_id)
+            .where(user_models.Technician.id.in_(set(assignments.values())))
         )
-        if excluded_tech_ids:
-            query = query.where(user_models.Technician.id.not_in(excluded_tech_ids))
-        
-        # Order by rating descending
-        query = query.order_by(user_models.Technician.average_rating.desc())
-        
-        result = await db.execute(query)
-        next_tech = result.scalars().first()
-        
-        if next_tech:
-            # Create Offer
-            offer = job_models.JobOffer(
-                job_id=job.id,
-                technician_id=next_tech.id,
-                status=JobOfferStatus.PENDING,
-                expires_at=datetime.utcnow() + timedelta(minutes=5) # 5 min timeout
+        tech_users = dict(result.all())
+    for job_id, technician_id in list(assignments.items()):
+        if technician_id not in tech_users:
+            # Deleted since the index saw it; drop it and retry the job next pass
+            technician_index.remove(technician_id)
+            del assignments[job_id]
+            _starved.add(job_id)
+
+    expires_at = now + timedelta(seconds=settings.MATCHING_OFFER_TIMEOUT_SECONDS)
+    new_offers = [
+        {
+            "job_id": job_id,
+            "technician_id": technician_id,
+            "status": JobOfferStatus.PENDING,
+            "expires_at": expires_at,
+        }
+        for job_id, technician_id in assignments.items()
+    ]
+
+    if new_offers:
+        await db.execute(insert(JobOffer), new_offers)
+        for offer in new_offers:
+            notification_service.enqueue_notification(
+                db,
+                tech_users[offer["technician_id"]],
+                "New job offer",
+                {"job_id": offer["job_id"], "expires_at": expires_at.isoformat()},
+                dedupe_key=f"offer:{offer['job_id']}",
             )
-            db.add(offer)
-            await db.commit()
-            print(f"Offer created for Job {job.id} to Tech {next_tech.id}")
-        else:
-            # No tech found. Log or notify?
-            pass
-
-    # Ensure clean transaction close
     await db.commit()
+    _publish_events(promoted, expired, new_offers)
+
+    for offer in new_offers:
+        # Re-run matching for this job as soon as the offer times out
+        matching_queue.push_later(offer["job_id"], settings.MATCHING_OFFER_TIMEOUT_SECONDS + 1)
+    if new_offers:
+        logger.info(f"Offers created: {len(new_offers)} of {len(open_jobs)} open jobs")
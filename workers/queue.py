@@ -0,0 +1,57 @@
+import asyncio
+from typing import List, Optional, Set
+
+class MatchingQueue:
+    """
+    In-process queue of job ids that need a matching pass.
+    Pushing a job that is already waiting is a no-op, so bursts of events
+    for the same job (create, reject, expiry) collapse into one work item.
+    """
+    def __init__(self):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._pending: Set[str] = set()
+
+    def push(self, job_id: str):
+        if job_id in self._pending:
+            return
+        self._pending.add(job_id)
+        self._queue.put_nowait(job_id)
+
+    def push_later(self, job_id: str, delay: float):
+        """
+        Schedule a push after `delay` seconds, e.g. when an offer expires.
+        Outside a running loop nothing is scheduled; the reconciliation
+        sweep picks the job up once the offer is due.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        loop.call_later(delay, self.push, job_id)
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    async def get_batch(self, timeout: Optional[float] = None, max_items: int = 500) -> List[str]:
+        """
+        Wait up to `timeout` seconds for work, then drain whatever else is
+        already queued. Returns an empty list on timeout.
+        """
+        try:
+            first = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return []
+
+        batch = [first]
+        while len(batch) < max_items:
+            try:
+                batch.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        for job_id in batch:
+            self._pending.discard(job_id)
+        return batch
+
+# Shared by the job service (producer) and the matching worker (consumer)
+matching_queue = MatchingQueue()
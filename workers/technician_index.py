@@ -0,0 +1,178 @@
+import bisect
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, String, type_coerce
+from modules.users import models as user_models
+from workers.geo_index import GeoIndex
+
+class TechnicianIndex:
+    """
+    Resident index of verified technicians, kept sorted best rating first.
+
+    Matching asks it for the next candidate instead of sorting the
+    technicians table per job. Services update it in place when a
+    technician is verified or reviewed. Changes made by other processes
+    are picked up by `refresh()`, which only reads technicians whose
+    `updated_at` is at or past the last one seen (the matching worker
+    refreshes on every reconciliation sweep). `invalidate()` still forces
+    a full reload on next use.
+
+    Updates keep `_keys` sorted with bisect: O(log n) to find the slot,
+    but the list insert/delete itself shifts entries, so an update is
+    O(n) memmove. That is cheap at the sizes we run (thousands), and far
+    cheaper than re-sorting or re-querying per job.
+
+    Technicians with coordinates are also kept in a `GeoIndex` so matching
+    can ask for the nearest ones to a job.
+    """
+    def __init__(self):
+        # (-rating, technician_id), so ascending order == best first
+        self._keys: List[Tuple[float, str]] = []
+        self._ratings: Dict[str, float] = {}
+        self.geo = GeoIndex()
+        self._loaded = False
+        self._watermark: Optional[str] = None # Raw updated_at, compared as stored (see core.pagination)
+        self._listeners: List[Callable[[Optional[str]], None]] = []
+        self.version = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, technician_id: str):
+        return technician_id in self._ratings
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def add_listener(self, callback: Callable[[Optional[str]], None]):
+        """
+        Register a callback fired with the technician id on every change,
+        or with None when the whole index is invalidated.
+        """
+        self._listeners.append(callback)
+
+    def _changed(self, technician_id: Optional[str]):
+        self.version += 1
+        for callback in self._listeners:
+            callback(technician_id)
+
+    async def ensure_loaded(self, db: AsyncSession):
+        if not self._loaded:
+            await self.reload(db)
+
+    async def reload(self, db: AsyncSession):
+        Technician = user_models.Technician
+        # Watermark over all rows, so a later verification counts as a change
+        self._watermark = await db.scalar(select(func.max(type_coerce(Technician.updated_at, String))))
+        result = await db.execute(
+            select(Technician.id, Technician.average_rating, Technician.latitude, Technician.longitude)
+            .where(Technician.is_verified == True)
+        )
+        rows = result.all()
+        self._ratings = {tech_id: rating or 0.0 for tech_id, rating, _, _ in rows}
+        self._keys = sorted((-rating, tech_id) for tech_id, rating in self._ratings.items())
+        self.geo.clear()
+        for tech_id, _, latitude, longitude in rows:
+            if latitude is not None and longitude is not None:
+                self.geo.upsert(tech_id, latitude, longitude)
+        self._loaded = True
+        self._changed(None)
+
+    async def refresh(self, db: AsyncSession):
+        """
+        Apply technicians changed since the last load or refresh, one
+        indexed query for the delta. Rows stamped exactly at the watermark
+        are read again (timestamps are only second-precise on SQLite);
+        re-applying an unchanged row is skipped.
+        """
+        if not self._loaded:
+            await self.reload(db)
+            return
+        Technician = user_models.Technician
+        raw_updated = type_coerce(Technician.updated_at, String)
+        query = select(
+            Technician.id,
+            Technician.is_verified,
+            Technician.average_rating,
+            Technician.latitude,
+            Technician.longitude,
+            raw_updated,
+        )
+        if self._watermark is None:
+            query = query.where(Technician.updated_at.isnot(None))
+        else:
+            query = query.where(raw_updated >= self._watermark)
+        for tech_id, is_verified, rating, latitude, longitude, updated in (await db.execute(query)).all():
+            self._watermark = max(self._watermark or updated, updated)
+            if not is_verified:
+                self.remove(tech_id)
+                continue
+            location = (latitude, longitude) if latitude is not None and longitude is not None else None
+            if self._ratings.get(tech_id) == (rating or 0.0) and self.geo.get(tech_id) == location:
+                continue
+            self.upsert(tech_id, rating, latitude, longitude)
+
+    def invalidate(self):
+        self._loaded = False
+        self._changed(None)
+
+    def upsert(
+        self,
+        technician_id: str,
+        rating: float,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+    ):
+        rating = rating or 0.0
+        self._discard(technician_id)
+        self._ratings[technician_id] = rating
+        bisect.insort(self._keys, (-rating, technician_id))
+        if latitude is not None and longitude is not None:
+            self.geo.upsert(technician_id, latitude, longitude)
+        self._changed(technician_id)
+
+    def remove(self, technician_id: str):
+        if self._discard(technician_id):
+            self._changed(technician_id)
+
+    def _discard(self, technician_id: str) -> bool:
+        rating = self._ratings.pop(technician_id, None)
+        if rating is None:
+            return False
+        self.geo.remove(technician_id)
+        key = (-rating, technician_id)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            del self._keys[i]
+        return True
+
+    def candidates(self, exclude: Iterable[str] = ()) -> Iterable[str]:
+        """Yield technician ids best rating first, skipping `exclude`."""
+        skip: Set[str] = exclude if isinstance(exclude, set) else set(exclude)
+        for _, technician_id in self._keys:
+            if technician_id not in skip:
+                yield technician_id
+
+    def next_candidate(self, exclude: Iterable[str] = ()) -> Optional[str]:
+        """
+        Best rated technician not in `exclude`. Walks from the head and
+        skips excluded entries one by one, so the cost is O(len(exclude))
+        (plus building the set when a list is passed), not a scan of the
+        whole index.
+        """
+        return next(iter(self.candidates(exclude)), None)
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        k: int = 1,
+        max_km: Optional[float] = None,
+        accept: Optional[Callable[[str], bool]] = None,
+    ) -> List[Tuple[float, str]]:
+        """(distance_km, technician_id) for the k nearest located technicians."""
+        return self.geo.nearest(latitude, longitude, k=k, max_km=max_km, accept=accept)
+
+# One index per process, shared by services and the matching worker
+technician_index = TechnicianIndex()